@@ -1,12 +1,28 @@
 import torch
 import torch.nn.functional as F
 from torch_geometric.nn import GCNConv, GATConv, global_mean_pool  # type: ignore
+from torch_geometric.nn.conv.gcn_conv import gcn_norm  # type: ignore
 from torch_geometric.data import Data, Batch  # type: ignore
+from torch_geometric.utils import to_torch_csr_tensor  # type: ignore
 import numpy as np
-from typing import List, Dict, Tuple
+import threading
+from typing import List, Dict, Tuple, Union
 import geopandas as gpd  # type: ignore
-from shapely.geometry import Point, Polygon  # type: ignore
+from shapely.geometry import Polygon  # type: ignore
 import networkx as nx
+import shapely
+from scipy.sparse import coo_matrix  # type: ignore
+from scipy.sparse.csgraph import connected_components  # type: ignore
+from scipy.spatial import cKDTree  # type: ignore
+
+from app.utils.geospatial import coords_to_array, zone_centers
+
+ZONE_TYPES = ['park', 'garden', 'forest', 'wetland']
+ZONE_TYPE_INDEX = {zone_type: idx for idx, zone_type in enumerate(ZONE_TYPES)}
+
+# Terrain node features: elevation and slope normalized by these scales, encoded soil type, water presence
+SOIL_ENCODING = {'clay': 0.25, 'sand': 0.5, 'loam': 0.75, 'rocky': 1.0}
+TERRAIN_FEATURE_SCALE = np.array([100.0, 45.0, 1.0, 1.0])
 
 class UrbanGNN(torch.nn.Module):
     def __init__(self, input_dim: int = 10, hidden_dim: int = 64, output_dim: int = 4):
@@ -16,9 +32,10 @@ class UrbanGNN(torch.nn.Module):
         self.gat1 = GATConv(input_dim, hidden_dim, heads=4, dropout=0.1)
         self.gat2 = GATConv(hidden_dim * 4, hidden_dim, heads=2, dropout=0.1)
         
-        # Graph Convolutional layers for feature propagation
-        self.gcn1 = GCNConv(hidden_dim * 2, hidden_dim)
-        self.gcn2 = GCNConv(hidden_dim, hidden_dim // 2)
+        # Graph Convolutional layers for feature propagation; the adjacency is normalized
+        # once per forward pass and shared, since both layers run on the same graph
+        self.gcn1 = GCNConv(hidden_dim * 2, hidden_dim, normalize=False)
+        self.gcn2 = GCNConv(hidden_dim, hidden_dim // 2, normalize=False)
         
         # Output layers for different predictions
         self.zone_classifier = torch.nn.Linear(hidden_dim // 2, 4)  # 4 zone types
@@ -28,20 +45,28 @@ class UrbanGNN(torch.nn.Module):
         
         self.dropout = torch.nn.Dropout(0.2)
         
-    def forward(self, x, edge_index, batch=None):
+    def forward(self, x, edge_index, batch=None, num_graphs=None):
         # Graph Attention Network layers
         x = F.elu(self.gat1(x, edge_index))
         x = self.dropout(x)
         x = F.elu(self.gat2(x, edge_index))
         
-        # Graph Convolutional layers
-        x = F.elu(self.gcn1(x, edge_index))
+        # Graph Convolutional layers, sharing one symmetric normalization with self-loops,
+        # packed as a transposed CSR adjacency so propagation runs as a sparse matmul
+        gcn_edge_index, gcn_edge_weight = gcn_norm(
+            edge_index, num_nodes=x.size(0), add_self_loops=True, dtype=x.dtype
+        )
+        gcn_adj_t = to_torch_csr_tensor(
+            gcn_edge_index.flip(0), gcn_edge_weight, size=(x.size(0), x.size(0))
+        )
+        x = F.elu(self.gcn1(x, gcn_adj_t))
         x = self.dropout(x)
-        x = F.elu(self.gcn2(x, edge_index))
+        x = F.elu(self.gcn2(x, gcn_adj_t))
         
         # Global pooling for graph-level predictions
         if batch is not None:
-            graph_embedding = global_mean_pool(x, batch)
+            # Sized explicitly so trailing empty graphs still get a row and rows stay aligned with graphs
+            graph_embedding = global_mean_pool(x, batch, size=num_graphs)
         else:
             graph_embedding = torch.mean(x, dim=0, keepdim=True)
         
@@ -64,10 +89,19 @@ class UrbanPlanningGNN:
         self.device = torch.device('cuda' if torch.cuda.is_available() else 'cpu')
         self.model = UrbanGNN().to(self.device)
         
+        # Reusable pinned host buffer for node features on GPU deployments, grown on demand
+        self._pinned_features = None
+        self._pinned_copy_done = None
+        self._pinned_lock = threading.Lock()
+        
         if model_path:
             self.load_model(model_path)
         else:
             self._initialize_pretrained_weights()
+        
+        # Serving only runs inference, so switch dropout off once here; half precision on GPU
+        self.dtype = torch.float16 if self.device.type == 'cuda' else torch.float32
+        self.model.to(dtype=self.dtype).eval()
     
     def _initialize_pretrained_weights(self):
         """Initialize with reasonable weights for urban planning"""
@@ -77,153 +111,174 @@ class UrbanPlanningGNN:
                 if module.bias is not None:
                     torch.nn.init.zeros_(module.bias)
     
-    def create_urban_graph(self, region_coords: List[Dict], terrain_data: List[Dict], 
+    def create_urban_graph(self, region_coords: List[Dict], terrain_data: Union[List[Dict], np.ndarray], 
                           existing_zones: List[Dict] = None) -> Data:
         """Create a graph representation of the urban area"""
         
-        # Create spatial grid
-        grid_points = self._create_spatial_grid(region_coords, grid_size=50)
+        # Create spatial grid as an (N, 2) lat/lng array
+        points = self._create_spatial_grid(region_coords, grid_size=50)
+        
+        # Terrain features for every grid point from one nearest-neighbour query
+        terrain_features = self._interpolate_terrain_features(points, terrain_data)
         
-        # Extract features for each grid point
-        node_features = []
-        for point in grid_points:
-            features = self._extract_point_features(point, terrain_data, existing_zones)
-            node_features.append(features)
+        # Existing zone features, from zone centers computed once per graph
+        zone_features = self._calculate_zone_proximity(points, existing_zones or [])
+        
+        # Node features: lat, lng, 4 terrain features, 4 zone proximities
+        node_features = np.hstack((points, terrain_features, zone_features))
         
         # Create edges based on spatial proximity
-        edge_index = self._create_spatial_edges(grid_points, max_distance=100)
+        edge_index = self._create_spatial_edges(points, max_distance=100)
         
         # Convert to tensors
-        x = torch.tensor(node_features, dtype=torch.float32)
-        edge_index = torch.tensor(edge_index, dtype=torch.long).t().contiguous()
+        x = torch.from_numpy(node_features).to(torch.float32)
+        edge_index = torch.from_numpy(edge_index)
         
         # Add positional encoding
-        pos = torch.tensor([[p['lat'], p['lng']] for p in grid_points], dtype=torch.float32)
+        pos = torch.from_numpy(points).to(torch.float32)
         
         return Data(x=x, edge_index=edge_index, pos=pos)
     
-    def _create_spatial_grid(self, region_coords: List[Dict], grid_size: int = 50) -> List[Dict]:
-        """Create a regular grid of points within the region"""
+    def _create_spatial_grid(self, region_coords: List[Dict], grid_size: int = 50) -> np.ndarray:
+        """Create a regular grid of points within the region as an (N, 2) lat/lng array"""
         if not region_coords:
-            return []
+            return np.empty((0, 2))
         
         # Get bounding box
-        lats = [coord['lat'] for coord in region_coords]
-        lngs = [coord['lng'] for coord in region_coords]
-        
-        min_lat, max_lat = min(lats), max(lats)
-        min_lng, max_lng = min(lngs), max(lngs)
+        region_latlng = coords_to_array(region_coords)
+        min_lat, min_lng = region_latlng.min(axis=0)
+        max_lat, max_lng = region_latlng.max(axis=0)
         
         # Create region polygon
-        region_polygon = Polygon([(coord['lng'], coord['lat']) for coord in region_coords])
+        region_polygon = Polygon(region_latlng[:, ::-1])
         
-        # Generate grid points
-        grid_points = []
+        # Generate grid points, lat along the outer axis
         lat_step = (max_lat - min_lat) / grid_size
         lng_step = (max_lng - min_lng) / grid_size
+        lats, lngs = np.meshgrid(
+            min_lat + np.arange(grid_size) * lat_step,
+            min_lng + np.arange(grid_size) * lng_step,
+            indexing='ij'
+        )
+        lats, lngs = lats.ravel(), lngs.ravel()
         
-        for i in range(grid_size):
-            for j in range(grid_size):
-                lat = min_lat + i * lat_step
-                lng = min_lng + j * lng_step
-                point = Point(lng, lat)
-                
-                if region_polygon.contains(point):
-                    grid_points.append({'lat': lat, 'lng': lng})
-        
-        return grid_points
-    
-    def _extract_point_features(self, point: Dict, terrain_data: List[Dict], 
-                               existing_zones: List[Dict] = None) -> List[float]:
-        """Extract features for a single point"""
-        features = []
-        
-        # Spatial features
-        features.extend([point['lat'], point['lng']])
-        
-        # Terrain features (interpolated from nearest terrain data)
-        terrain_features = self._interpolate_terrain_features(point, terrain_data)
-        features.extend(terrain_features)
-        
-        # Existing zone features
-        zone_features = self._calculate_zone_proximity(point, existing_zones or [])
-        features.extend(zone_features)
-        
-        # Ensure fixed feature dimension
-        while len(features) < 10:
-            features.append(0.0)
-        
-        return features[:10]
+        # One batched containment check instead of a Point per grid cell
+        inside = shapely.contains_xy(region_polygon, lngs, lats)
+        return np.column_stack((lats[inside], lngs[inside]))
     
-    def _interpolate_terrain_features(self, point: Dict, terrain_data: List[Dict]) -> List[float]:
-        """Interpolate terrain features from nearby data points"""
-        if not terrain_data:
-            return [0.0, 0.0, 0.0, 0.0]  # elevation, slope, soil_type_encoded, water_presence
+    def _interpolate_terrain_features(self, points: np.ndarray,
+                                      terrain_data: Union[List[Dict], np.ndarray]) -> np.ndarray:
+        """Interpolate terrain features for each (lat, lng) point from the nearest terrain data point"""
+        if terrain_data is None or len(terrain_data) == 0 or len(points) == 0:
+            return np.zeros((len(points), 4))  # elevation, slope, soil_type_encoded, water_presence
+        
+        if isinstance(terrain_data, np.ndarray):
+            # Record array from GeospatialProcessor.generate_terrain_records, sliced by field
+            soil_names, soil_idx = np.unique(terrain_data['soil_type'], return_inverse=True)
+            soil_codes = np.array([SOIL_ENCODING.get(name, 0.5) for name in soil_names.tolist()])
+            terrain_table = np.column_stack((
+                terrain_data['elevation'], terrain_data['slope'],
+                soil_codes[soil_idx], terrain_data['water_presence']
+            )) / TERRAIN_FEATURE_SCALE
+            terrain_points = np.column_stack((terrain_data['lat'], terrain_data['lng']))
+        else:
+            # One pass over the terrain records, encoding soil type, then normalize elevation and slope
+            terrain_table = np.fromiter(
+                (
+                    value
+                    for terrain in terrain_data
+                    for value in (
+                        terrain.get('elevation', 0.0),
+                        terrain.get('slope', 0.0),
+                        SOIL_ENCODING.get(terrain.get('soil_type', 'loam'), 0.5),
+                        terrain.get('water_presence', False)
+                    )
+                ),
+                dtype=np.float64, count=4 * len(terrain_data)
+            ).reshape(-1, 4) / TERRAIN_FEATURE_SCALE
+            terrain_points = coords_to_array([t['coordinates'] for t in terrain_data])
         
         # Find nearest terrain data point
-        min_distance = float('inf')
-        nearest_terrain = terrain_data[0]
-        
-        for terrain in terrain_data:
-            distance = ((point['lat'] - terrain['coordinates']['lat']) ** 2 + 
-                       (point['lng'] - terrain['coordinates']['lng']) ** 2) ** 0.5
-            if distance < min_distance:
-                min_distance = distance
-                nearest_terrain = terrain
-        
-        # Encode soil type
-        soil_encoding = {'clay': 0.25, 'sand': 0.5, 'loam': 0.75, 'rocky': 1.0}
-        soil_encoded = soil_encoding.get(nearest_terrain.get('soil_type', 'loam'), 0.5)
-        
-        return [
-            nearest_terrain.get('elevation', 0.0) / 100.0,  # Normalize elevation
-            nearest_terrain.get('slope', 0.0) / 45.0,       # Normalize slope
-            soil_encoded,
-            float(nearest_terrain.get('water_presence', False))
+        tree = cKDTree(terrain_points)
+        _, nearest = tree.query(points, k=1)
+        return terrain_table[nearest]
+    
+    def _calculate_zone_proximity(self, points: np.ndarray, existing_zones: List[Dict]) -> np.ndarray:
+        """Calculate proximity of each (lat, lng) point to the existing zones of each type"""
+        zone_proximities = np.zeros((len(points), len(ZONE_TYPES)))  # park, garden, forest, wetland proximity
+        
+        # Zone centers once, for zones of a known type with coordinates
+        zones = [
+            zone for zone in existing_zones
+            if zone.get('type', 'park') in ZONE_TYPE_INDEX and zone.get('coordinates')
         ]
+        if not zones or len(points) == 0:
+            return zone_proximities
+        center_lat, center_lng = zone_centers(zones)
+        
+        # Calculate distance from every point to every zone center
+        distance = np.sqrt((points[:, :1] - center_lat[None, :]) ** 2 +
+                           (points[:, 1:] - center_lng[None, :]) ** 2)
+        
+        # Convert distance to proximity (closer = higher value), keep the closest zone per type
+        proximity = np.maximum(0, 1 - distance * 1000)  # Adjust scale as needed
+        zone_type_idx = np.fromiter(
+            (ZONE_TYPE_INDEX[zone.get('type', 'park')] for zone in zones), dtype=np.intp, count=len(zones)
+        )
+        for type_idx in np.unique(zone_type_idx):
+            zone_proximities[:, type_idx] = proximity[:, zone_type_idx == type_idx].max(axis=1)
+        
+        return zone_proximities
     
-    def _calculate_zone_proximity(self, point: Dict, existing_zones: List[Dict]) -> List[float]:
-        """Calculate proximity to existing zones"""
-        if not existing_zones:
-            return [0.0, 0.0, 0.0, 0.0]  # park, garden, forest, wetland proximity
-        
-        zone_proximities = {'park': 0.0, 'garden': 0.0, 'forest': 0.0, 'wetland': 0.0}
-        
-        for zone in existing_zones:
-            zone_type = zone.get('type', 'park')
-            if zone_type in zone_proximities:
-                # Calculate distance to zone center
-                zone_coords = zone.get('coordinates', [])
-                if zone_coords:
-                    center_lat = sum(c['lat'] for c in zone_coords) / len(zone_coords)
-                    center_lng = sum(c['lng'] for c in zone_coords) / len(zone_coords)
-                    
-                    distance = ((point['lat'] - center_lat) ** 2 + 
-                               (point['lng'] - center_lng) ** 2) ** 0.5
-                    
-                    # Convert distance to proximity (closer = higher value)
-                    proximity = max(0, 1 - distance * 1000)  # Adjust scale as needed
-                    zone_proximities[zone_type] = max(zone_proximities[zone_type], proximity)
-        
-        return list(zone_proximities.values())
+    def _create_spatial_edges(self, points: np.ndarray, max_distance: float = 100,
+                              block_size: int = 512) -> np.ndarray:
+        """Create edges between spatially close (lat, lng) points as a (2, num_edges) index array"""
+        sources, targets = [], []
+        
+        # Pairwise distances a block of rows at a time to bound memory
+        for start in range(0, len(points), block_size):
+            block = points[start:start + block_size]
+            distance = np.sqrt(((block[:, None, :] - points[None, :, :]) ** 2).sum(axis=-1))
+            
+            # Convert to approximate meters (rough approximation), upper triangle only
+            mask = distance * 111000 <= max_distance
+            mask &= np.arange(len(points))[None, :] > np.arange(start, start + len(block))[:, None]
+            i, j = np.nonzero(mask)
+            sources.append(i + start)
+            targets.append(j)
+        
+        i = np.concatenate(sources) if sources else np.empty(0, dtype=np.int64)
+        j = np.concatenate(targets) if targets else np.empty(0, dtype=np.int64)
+        
+        # Undirected graph: each pair contributes i->j followed by j->i
+        edges = np.empty((2, 2 * len(i)), dtype=np.int64)
+        edges[0, 0::2], edges[1, 0::2] = i, j
+        edges[0, 1::2], edges[1, 1::2] = j, i
+        return edges
     
-    def _create_spatial_edges(self, grid_points: List[Dict], max_distance: float = 100) -> List[List[int]]:
-        """Create edges between spatially close points"""
-        edges = []
-        
-        for i, point1 in enumerate(grid_points):
-            for j, point2 in enumerate(grid_points[i+1:], i+1):
-                distance = ((point1['lat'] - point2['lat']) ** 2 + 
-                           (point1['lng'] - point2['lng']) ** 2) ** 0.5
-                
-                # Convert to approximate meters (rough approximation)
-                distance_meters = distance * 111000
-                
-                if distance_meters <= max_distance:
-                    edges.append([i, j])
-                    edges.append([j, i])  # Undirected graph
+    def _features_to_device(self, x: torch.Tensor) -> torch.Tensor:
+        """Move node features to the model device, staging through pinned memory on CUDA"""
+        if self.device.type != 'cuda':
+            return x
+        
+        with self._pinned_lock:
+            if self._pinned_features is None or self._pinned_features.shape[0] < x.shape[0]:
+                # Sized for at least one full 50x50 grid so single-region requests never regrow it
+                self._pinned_features = torch.empty(
+                    (max(x.shape[0], 2500), x.shape[1]), dtype=x.dtype, pin_memory=True
+                )
+                self._pinned_copy_done = None
+            elif self._pinned_copy_done is not None:
+                # The previous asynchronous copy must finish before the buffer is overwritten
+                self._pinned_copy_done.synchronize()
+            
+            staged = self._pinned_features[:x.shape[0]]
+            staged.copy_(x)
+            x_device = staged.to(self.device, dtype=self.dtype, non_blocking=True)
+            self._pinned_copy_done = torch.cuda.Event()
+            self._pinned_copy_done.record()
         
-        return edges
+        return x_device
     
     def predict_optimal_zones(self, region_coords: List[Dict], terrain_data: List[Dict],
                              existing_zones: List[Dict] = None, 
@@ -234,26 +289,83 @@ class UrbanPlanningGNN:
         graph_data = self.create_urban_graph(region_coords, terrain_data, existing_zones)
         
         # Run inference
-        self.model.eval()
-        with torch.no_grad():
-            graph_data = graph_data.to(self.device)
-            predictions = self.model(graph_data.x, graph_data.edge_index)
+        with torch.inference_mode():
+            x = self._features_to_device(graph_data.x)
+            edge_index = graph_data.edge_index.to(self.device, non_blocking=True)
+            predictions = self.model(x, edge_index)
         
         # Process predictions
-        zone_probs = F.softmax(predictions['zone_predictions'], dim=1)
+        zone_probs = F.softmax(predictions['zone_predictions'].float(), dim=1)
         
-        # Generate optimal zones based on predictions
-        optimal_zones = self._generate_zones_from_predictions(
-            graph_data.pos.cpu().numpy(),
+        return self._build_prediction_result(
+            graph_data.pos.numpy(),
             zone_probs.cpu().numpy(),
+            predictions['sustainability'].float().cpu().item(),
+            predictions['accessibility'].float().cpu().item(),
+            predictions['connectivity'].float().cpu().item(),
             constraints or {}
         )
+    
+    def predict_optimal_zones_batch(self, region_coords_list: List[List[Dict]],
+                                    terrain_data_list: List[List[Dict]],
+                                    existing_zones_list: List[List[Dict]] = None,
+                                    constraints_list: List[Dict] = None) -> List[Dict]:
+        """Predict optimal green zone placements for several regions in one forward pass"""
+        if not region_coords_list:
+            return []
+        
+        count = len(region_coords_list)
+        existing_zones_list = existing_zones_list or [None] * count
+        constraints_list = constraints_list or [None] * count
+        
+        # Merge the per-region graphs into one disconnected batch graph
+        graphs = [
+            self.create_urban_graph(region_coords, terrain_data, existing_zones)
+            for region_coords, terrain_data, existing_zones
+            in zip(region_coords_list, terrain_data_list, existing_zones_list)
+        ]
+        batch = Batch.from_data_list(graphs)
+        
+        # Run inference
+        with torch.inference_mode():
+            x = self._features_to_device(batch.x)
+            edge_index = batch.edge_index.to(self.device, non_blocking=True)
+            predictions = self.model(
+                x, edge_index, batch.batch.to(self.device, non_blocking=True), batch.num_graphs
+            )
+        
+        # Process predictions
+        zone_probs = F.softmax(predictions['zone_predictions'].float(), dim=1).cpu().numpy()
+        positions = batch.pos.numpy()
+        sustainability = predictions['sustainability'].float().cpu().view(-1).tolist()
+        accessibility = predictions['accessibility'].float().cpu().view(-1).tolist()
+        connectivity = predictions['connectivity'].float().cpu().view(-1).tolist()
+        ptr = batch.ptr.tolist()
+        
+        return [
+            self._build_prediction_result(
+                positions[ptr[i]:ptr[i + 1]],
+                zone_probs[ptr[i]:ptr[i + 1]],
+                sustainability[i],
+                accessibility[i],
+                connectivity[i],
+                constraints_list[i] or {}
+            )
+            for i in range(count)
+        ]
+    
+    def _build_prediction_result(self, positions: np.ndarray, zone_probs: np.ndarray,
+                                 sustainability: float, accessibility: float,
+                                 connectivity: float, constraints: Dict) -> Dict:
+        """Assemble the prediction payload for a single region"""
+        # Generate optimal zones based on predictions
+        optimal_zones = self._generate_zones_from_predictions(positions, zone_probs, constraints)
         
         return {
             'optimal_zones': optimal_zones,
-            'sustainability_score': float(predictions['sustainability'].cpu().item()),
-            'accessibility_score': float(predictions['accessibility'].cpu().item()),
-            'connectivity_score': float(predictions['connectivity'].cpu().item()),
+            'sustainability_score': float(sustainability),
+            'accessibility_score': float(accessibility),
+            'connectivity_score': float(connectivity),
             'confidence': 0.85  # Mock confidence score
         }
     
@@ -262,12 +374,18 @@ class UrbanPlanningGNN:
                                        constraints: Dict) -> List[Dict]:
         """Generate zone proposals from GNN predictions"""
         zones = []
-        zone_types = ['park', 'garden', 'forest', 'wetland']
+        zone_types = ZONE_TYPES
+        
+        # Softmax rows can exceed 0.7 for at most one type, so one argmax pass buckets every point
+        best_type = zone_probs.argmax(axis=1)
+        candidates = np.flatnonzero(zone_probs.max(axis=1) > 0.7)
+        candidates = candidates[np.argsort(best_type[candidates], kind='stable')]
+        splits = np.searchsorted(best_type[candidates], np.arange(len(zone_types) + 1))
         
         # Find high-probability regions for each zone type
         for zone_idx, zone_type in enumerate(zone_types):
-            # Get points with high probability for this zone type
-            high_prob_indices = np.where(zone_probs[:, zone_idx] > 0.7)[0]
+            # Points with high probability for this zone type, in grid order
+            high_prob_indices = candidates[splits[zone_idx]:splits[zone_idx + 1]]
             
             if len(high_prob_indices) > 5:  # Minimum points for a zone
                 # Cluster nearby points
@@ -291,32 +409,24 @@ class UrbanPlanningGNN:
         return zones[:6]  # Limit to 6 zones
     
     def _cluster_points(self, points: np.ndarray, max_distance: float = 0.001) -> List[np.ndarray]:
-        """Simple clustering of nearby points"""
+        """Single-linkage clustering of nearby points"""
         if len(points) == 0:
             return []
         
-        clusters = []
-        used = set()
+        # Link every pair within max_distance and take the connected components as clusters
+        pairs = cKDTree(points).query_pairs(max_distance, output_type='ndarray')
+        adjacency = coo_matrix(
+            (np.ones(len(pairs), dtype=np.int8), (pairs[:, 0], pairs[:, 1])),
+            shape=(len(points), len(points))
+        )
+        _, labels = connected_components(adjacency, directed=False)
         
-        for i, point in enumerate(points):
-            if i in used:
-                continue
-            
-            cluster = [point]
-            used.add(i)
-            
-            # Find nearby points
-            for j, other_point in enumerate(points):
-                if j in used:
-                    continue
-                
-                distance = np.linalg.norm(point - other_point)
-                if distance <= max_distance:
-                    cluster.append(other_point)
-                    used.add(j)
-            
+        # Components are labelled in order of their first point, points stay in input order
+        clusters = []
+        for label in range(labels.max() + 1):
+            cluster = points[labels == label]
             if len(cluster) >= 3:
-                clusters.append(np.array(cluster))
+                clusters.append(cluster)
         
         return clusters
     
@@ -332,7 +442,34 @@ class UrbanPlanningGNN:
         area = 0.5 * abs(sum(x[i] * y[i+1] - x[i+1] * y[i] for i in range(-1, len(x)-1)))
         
         # Convert to approximate square meters
-        return area * 111000 * 111000
+        return float(area * 111000 * 111000)
+    
+    def quantize(self) -> bool:
+        """Swap Linear layers for INT8 dynamically quantized versions (CPU inference only)"""
+        if self.device.type != 'cpu':
+            return False
+        
+        self.model = torch.ao.quantization.quantize_dynamic(
+            self.model, {torch.nn.Linear}, dtype=torch.qint8
+        )
+        return True
+    
+    def compile(self) -> bool:
+        """Compile the model with torch.compile, keeping the eager model if compilation fails"""
+        compiled = torch.compile(self.model, dynamic=True)
+        
+        # Compilation is lazy, so run a small warm-up graph to surface failures at load time
+        x = torch.rand((8, 10), device=self.device, dtype=self.dtype)
+        edge_index = torch.tensor([[i for i in range(7)], [i + 1 for i in range(7)]], device=self.device)
+        try:
+            with torch.inference_mode():
+                compiled(x, edge_index)
+        except Exception as e:
+            print(f"torch.compile unavailable, using eager GNN model: {e}")
+            return False
+        
+        self.model = compiled
+        return True
     
     def save_model(self, path: str):
         """Save the trained model"""
@@ -1,7 +1,8 @@
-from pydantic import BaseModel, Field
-from typing import List, Optional, Dict, Any
+from pydantic import BaseModel, BeforeValidator, ConfigDict, Field, field_validator
+from typing import Annotated, List, Optional, Dict, Any
 from datetime import datetime
 from enum import Enum
+import uuid
 
 class ZoneType(str, Enum):
     park = "park"
@@ -46,6 +47,9 @@ class GNNPredictions(BaseModel):
     confidence: float = 0.0
 
 class Scenario(BaseModel):
+    # Unknown keys (e.g. the frontend's camelCase greenZones) are rejected rather than dropped
+    model_config = ConfigDict(extra='forbid')
+
     id: str
     name: str
     timestamp: datetime = Field(default_factory=datetime.now)
@@ -68,10 +72,35 @@ class Project(BaseModel):
     scenario: Scenario
     user_id: str = "default_user"
 
+def _assign_scenario_id(value: Any) -> Any:
+    """Give a scenario that has not been saved yet a fresh ID"""
+    if isinstance(value, dict) and not value.get('id'):
+        value = {**value, 'id': str(uuid.uuid4())}
+    return value
+
+# Scenario as submitted with a project; create and update validate it the same way
+ScenarioInput = Annotated[Scenario, BeforeValidator(_assign_scenario_id)]
+
 class ProjectCreate(BaseModel):
     name: str
     region: str
-    scenario: Scenario
+    status: ProjectStatus = ProjectStatus.draft
+    scenario: Optional[ScenarioInput] = None
+
+class ProjectUpdate(BaseModel):
+    """Partial update; only the fields present in the request body are applied"""
+    name: Optional[str] = None
+    region: Optional[str] = None
+    status: Optional[ProjectStatus] = None
+    scenario: Optional[ScenarioInput] = None
+
+    @field_validator('name', 'region')
+    @classmethod
+    def reject_null(cls, value: Optional[str]) -> str:
+        """name and region may be omitted but not cleared"""
+        if value is None:
+            raise ValueError('must not be null')
+        return value
 
 class AnalysisRequest(BaseModel):
     region: List[Coordinate]
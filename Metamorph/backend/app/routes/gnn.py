@@ -1,28 +1,83 @@
 from fastapi import APIRouter, HTTPException, BackgroundTasks
-from typing import List, Dict, Any, Optional
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import ORJSONResponse
+from typing import List, Dict, Any, Optional, Tuple
 import asyncio
+import hashlib
+import heapq
+import logging
+import os
+import threading
 import uuid
-from datetime import datetime
+from datetime import datetime, timezone
+from functools import lru_cache
 
+import numpy as np
+import orjson
+from cachetools import LRUCache, TTLCache
+from sqlalchemy import insert
+from sqlalchemy.dialects import postgresql, sqlite
+
+from app.config.database import SessionLocal, engine, TerrainDataModel, TrainingJobModel
 from app.models.schemas import GNNOptimizationRequest, GreenZone, Coordinate
 from app.models.gnn_model import UrbanPlanningGNN
 from app.utils.geospatial import GeospatialProcessor
 
-router = APIRouter()
+logger = logging.getLogger(__name__)
+
+router = APIRouter(default_response_class=ORJSONResponse)
 
 # Global GNN model instance
 gnn_model = None
 geo_processor = GeospatialProcessor()
 
-# Training job tracking
-training_jobs = {}
+# ON CONFLICT upserts are dialect constructs; both supported backends spell them the same way
+upsert_insert = sqlite.insert if engine.dialect.name == "sqlite" else postgresql.insert
+
+# INT8 dynamic quantization of the model's Linear layers at load time (CPU only)
+GNN_QUANTIZE = os.getenv("GNN_QUANTIZE", "1") == "1"
+
+# torch.compile the model at load time; off by default as it adds startup and recompile time
+GNN_COMPILE = os.getenv("GNN_COMPILE", "0") == "1"
+
+# Training job tracking, shared through Redis when configured so every worker sees every job
+TRAINING_JOB_TTL_SECONDS = 24 * 3600
+REDIS_URL = os.getenv("REDIS_URL")
+training_jobs = TTLCache(maxsize=10_000, ttl=TRAINING_JOB_TTL_SECONDS)
+redis_client = None
+if REDIS_URL:
+    import redis.asyncio as aioredis
+    redis_client = aioredis.from_url(REDIS_URL)
+
+# Cache of GNN predictions keyed by a hash of the request inputs
+prediction_cache = LRUCache(maxsize=512)
+prediction_cache_lock = threading.Lock()
+prediction_cache_stats = {"hits": 0, "misses": 0}
+
+# Zone type indices for the per-type rate tables below
+ZONE_TYPE_INDEX = {'park': 0, 'garden': 1, 'forest': 2, 'wetland': 3}
+OTHER_ZONE_INDEX = len(ZONE_TYPE_INDEX)
 
-@router.on_event("startup")
-async def load_gnn_model():
-    """Load the GNN model on startup"""
+# Rate tables ordered as park, garden, forest, wetland, other
+SEQUESTRATION_RATES = np.array([2.5, 1.5, 4.0, 3.0, 2.0])  # tons CO2/hectare/year
+BIODIVERSITY_SCORES = np.array([60.0, 40.0, 90.0, 85.0, 50.0])
+COOLING_EFFECTS = np.array([3.0, 2.0, 4.0, 3.5, 2.5])  # degrees Celsius reduction
+NOISE_REDUCTION_DB = np.array([5.0, 3.0, 8.0, 4.0, 4.0])  # decibel reduction
+
+# Stacked so all per-type impacts come out of a single matrix-vector product
+IMPACT_RATES = np.vstack((SEQUESTRATION_RATES, COOLING_EFFECTS, NOISE_REDUCTION_DB, BIODIVERSITY_SCORES))
+for _rates in (SEQUESTRATION_RATES, BIODIVERSITY_SCORES, COOLING_EFFECTS, NOISE_REDUCTION_DB, IMPACT_RATES):
+    _rates.flags.writeable = False  # Shared by every request, never modified
+
+def load_gnn_model():
+    """Load the GNN model; called from the application lifespan in each worker"""
     global gnn_model
     try:
         gnn_model = UrbanPlanningGNN()
+        if GNN_QUANTIZE and gnn_model.quantize():
+            print("GNN model quantized to INT8")
+        if GNN_COMPILE and gnn_model.compile():
+            print("GNN model compiled with torch.compile")
         print("GNN model loaded successfully")
     except Exception as e:
         print(f"Failed to load GNN model: {e}")
@@ -41,7 +96,7 @@ async def get_gnn_status():
             "connectivity_optimization"
         ],
         "supported_zone_types": ["park", "garden", "forest", "wetland"],
-        "timestamp": datetime.now().isoformat()
+        "timestamp": datetime.now(timezone.utc)
     }
 
 @router.post("/optimize")
@@ -51,21 +106,24 @@ async def optimize_urban_planning(request: GNNOptimizationRequest):
         raise HTTPException(status_code=503, detail="GNN model not available")
     
     try:
+        # Convert Pydantic models to dictionaries for processing
+        payload = request.model_dump()
+        region_coords = payload['region']
+        existing_zones = payload['existing_zones']
+        terrain_data = payload['terrain_data']
+        
         # Validate input coordinates
-        if not geo_processor.validate_coordinates(request.region):
+        if not geo_processor.validate_coordinates(region_coords):
             raise HTTPException(status_code=400, detail="Invalid region coordinates")
         
-        # Convert Pydantic models to dictionaries for processing
-        region_coords = [coord.dict() for coord in request.region]
-        existing_zones = [zone.dict() for zone in request.existing_zones]
-        terrain_data = [terrain.dict() for terrain in request.terrain_data]
+        region_area = region_polygon_area(region_coords)
         
-        # Run GNN optimization
-        optimization_results = gnn_model.predict_optimal_zones(
-            region_coords=region_coords,
-            terrain_data=terrain_data,
-            existing_zones=existing_zones,
-            constraints=request.constraints or {}
+        # Run GNN optimization off the event loop
+        constraints = request.constraints or {}
+        optimization_results = await run_in_threadpool(
+            cached_predict,
+            prediction_cache_key(region_coords, terrain_data, existing_zones),
+            region_coords, terrain_data, existing_zones, constraints
         )
         
         # Calculate additional metrics
@@ -80,13 +138,14 @@ async def optimize_urban_planning(request: GNNOptimizationRequest):
                 "connectivity_score": optimization_results['connectivity_score'] * 100,
                 "confidence": optimization_results['confidence']
             },
-            "performance_metrics": calculate_performance_metrics(all_zones, region_coords),
+            "performance_metrics": calculate_performance_metrics(all_zones, region_area),
             "optimization_insights": generate_optimization_insights(optimization_results),
             "recommendations": generate_gnn_recommendations(optimization_results, request.optimization_goals),
-            "analysis_timestamp": datetime.now().isoformat()
+            "analysis_timestamp": datetime.now(timezone.utc)
         }
         
-        return enhanced_results
+        # Plain dicts/lists/numbers only, so skip jsonable_encoder and serialize directly
+        return ORJSONResponse(enhanced_results)
     
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"GNN optimization failed: {str(e)}")
@@ -99,39 +158,27 @@ async def predict_environmental_impact(request: GNNOptimizationRequest):
     
     try:
         # Convert inputs
-        region_coords = [coord.dict() for coord in request.region]
-        existing_zones = [zone.dict() for zone in request.existing_zones]
-        terrain_data = [terrain.dict() for terrain in request.terrain_data]
+        payload = request.model_dump()
+        region_coords = payload['region']
+        existing_zones = payload['existing_zones']
+        terrain_data = payload['terrain_data']
         
-        # Get GNN predictions
-        predictions = gnn_model.predict_optimal_zones(
-            region_coords=region_coords,
-            terrain_data=terrain_data,
-            existing_zones=existing_zones
+        # Get GNN predictions off the event loop
+        predictions = await run_in_threadpool(
+            cached_predict,
+            prediction_cache_key(region_coords, terrain_data, existing_zones),
+            region_coords, terrain_data, existing_zones
         )
         
         # Calculate environmental impact predictions
-        impact_predictions = {
-            "air_quality_improvement": predict_air_quality_impact(predictions, existing_zones),
-            "carbon_sequestration_potential": predict_carbon_sequestration(predictions),
-            "biodiversity_enhancement": predict_biodiversity_impact(predictions),
-            "water_management_efficiency": predict_water_management(predictions, terrain_data),
-            "heat_island_reduction": predict_heat_reduction(predictions),
-            "noise_pollution_reduction": predict_noise_reduction(predictions),
-            "overall_environmental_score": 0  # Will be calculated below
-        }
-        
-        # Calculate overall environmental score
-        impact_predictions["overall_environmental_score"] = sum(
-            impact_predictions[key] for key in impact_predictions if key != "overall_environmental_score"
-        ) / 6
+        impact_predictions = compute_all_impacts(predictions, existing_zones)
         
-        return {
+        return ORJSONResponse({
             "environmental_impact": impact_predictions,
             "confidence": predictions['confidence'],
             "methodology": "Graph Neural Network with spatial-temporal analysis",
-            "analysis_timestamp": datetime.now().isoformat()
-        }
+            "analysis_timestamp": datetime.now(timezone.utc)
+        })
     
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Environmental impact prediction failed: {str(e)}")
@@ -145,12 +192,12 @@ async def initiate_model_training(
     job_id = str(uuid.uuid4())
     
     # Store training job info
-    training_jobs[job_id] = {
+    await save_training_job(job_id, {
         "status": "initiated",
-        "start_time": datetime.now(),
+        "start_time": datetime.now(timezone.utc),
         "progress": 0,
         "estimated_completion": None
-    }
+    })
     
     # Add background training task
     background_tasks.add_task(train_gnn_model, job_id, training_data)
@@ -165,10 +212,11 @@ async def initiate_model_training(
 @router.get("/training-status/{job_id}")
 async def get_training_status(job_id: str):
     """Get status of a training job"""
-    if job_id not in training_jobs:
+    job = await load_training_job(job_id)
+    if job is None:
         raise HTTPException(status_code=404, detail="Training job not found")
     
-    return training_jobs[job_id]
+    return job
 
 @router.post("/scenario-comparison")
 async def compare_scenarios(scenarios: List[GNNOptimizationRequest]):
@@ -180,22 +228,22 @@ async def compare_scenarios(scenarios: List[GNNOptimizationRequest]):
         raise HTTPException(status_code=400, detail="Maximum 5 scenarios can be compared")
     
     try:
-        comparison_results = []
+        # Convert inputs
+        payloads = [scenario.model_dump() for scenario in scenarios]
+        scenario_inputs = [
+            (payload['region'], payload['terrain_data'], payload['existing_zones'])
+            for payload in payloads
+        ]
+        keys = [
+            prediction_cache_key(region_coords, terrain_data, existing_zones)
+            for region_coords, terrain_data, existing_zones in scenario_inputs
+        ]
         
-        for i, scenario in enumerate(scenarios):
-            # Convert inputs
-            region_coords = [coord.dict() for coord in scenario.region]
-            existing_zones = [zone.dict() for zone in scenario.existing_zones]
-            terrain_data = [terrain.dict() for terrain in scenario.terrain_data]
-            
-            # Get GNN predictions for this scenario
-            predictions = gnn_model.predict_optimal_zones(
-                region_coords=region_coords,
-                terrain_data=terrain_data,
-                existing_zones=existing_zones
-            )
-            
-            scenario_result = {
+        # Get GNN predictions for all scenarios in one batched call off the event loop
+        scenario_predictions = await run_in_threadpool(cached_predict_batch, keys, scenario_inputs)
+        
+        comparison_results = [
+            {
                 "scenario_id": i + 1,
                 "sustainability_score": predictions['sustainability_score'] * 100,
                 "accessibility_score": predictions['accessibility_score'] * 100,
@@ -204,8 +252,8 @@ async def compare_scenarios(scenarios: List[GNNOptimizationRequest]):
                 "optimal_zones_count": len(predictions['optimal_zones']),
                 "total_green_area": sum(zone['area'] for zone in predictions['optimal_zones'])
             }
-            
-            comparison_results.append(scenario_result)
+            for i, predictions in enumerate(scenario_predictions)
+        ]
         
         # Rank scenarios
         ranked_scenarios = rank_scenarios(comparison_results)
@@ -215,12 +263,39 @@ async def compare_scenarios(scenarios: List[GNNOptimizationRequest]):
             "ranking": ranked_scenarios,
             "best_scenario": ranked_scenarios[0] if ranked_scenarios else None,
             "comparison_metrics": generate_comparison_insights(comparison_results),
-            "analysis_timestamp": datetime.now().isoformat()
+            "analysis_timestamp": datetime.now(timezone.utc)
         }
     
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Scenario comparison failed: {str(e)}")
 
+@router.get("/cache-stats")
+async def get_cache_stats():
+    """Get prediction cache usage statistics"""
+    with prediction_cache_lock:
+        hits = prediction_cache_stats["hits"]
+        misses = prediction_cache_stats["misses"]
+        size = len(prediction_cache)
+    
+    return {
+        "size": size,
+        "max_size": prediction_cache.maxsize,
+        "hits": hits,
+        "misses": misses,
+        "hit_rate": hits / (hits + misses) if hits + misses > 0 else 0.0
+    }
+
+@router.post("/clear-cache")
+async def clear_cache():
+    """Clear all cached GNN predictions"""
+    with prediction_cache_lock:
+        cleared = len(prediction_cache)
+        prediction_cache.clear()
+        prediction_cache_stats["hits"] = 0
+        prediction_cache_stats["misses"] = 0
+    
+    return {"cleared_entries": cleared, "message": "Prediction cache cleared"}
+
 @router.post("/real-time-optimization")
 async def real_time_optimization(
     region: List[Coordinate],
@@ -233,11 +308,12 @@ async def real_time_optimization(
     
     try:
         # Generate synthetic terrain data for the region
-        region_coords = [coord.dict() for coord in region]
-        terrain_data = geo_processor.generate_terrain_grid(region_coords, grid_size=30)
+        region_coords = [coord.model_dump() for coord in region]
+        terrain_data = geo_processor.generate_terrain_records(region_coords, grid_size=30)
         
-        # Run optimization with current constraints
-        predictions = gnn_model.predict_optimal_zones(
+        # Run optimization with current constraints off the event loop
+        predictions = await run_in_threadpool(
+            gnn_model.predict_optimal_zones,
             region_coords=region_coords,
             terrain_data=terrain_data,
             existing_zones=[],
@@ -259,7 +335,7 @@ async def real_time_optimization(
                 "constraint_satisfaction": calculate_constraint_satisfaction(adjusted_zones, constraints)
             },
             "adaptive_recommendations": generate_adaptive_recommendations(adjusted_zones, constraints),
-            "timestamp": datetime.now().isoformat()
+            "timestamp": datetime.now(timezone.utc)
         }
     
     except Exception as e:
@@ -267,33 +343,180 @@ async def real_time_optimization(
 
 # Helper functions
 
+def prediction_cache_key(region_coords: List[Dict], terrain_data: List[Dict],
+                         existing_zones: List[Dict]) -> bytes:
+    """Build a stable cache key from the inputs that shape the GNN graph.
+
+    Constraints are left out: they do not change the model output, so every
+    route shares one cache entry per region, terrain and existing zone set.
+    """
+    payload = orjson.dumps(
+        (region_coords, terrain_data, existing_zones),
+        option=orjson.OPT_SORT_KEYS
+    )
+    return hashlib.blake2b(payload, digest_size=16).digest()
+
+def cached_predict(key: bytes, region_coords: List[Dict], terrain_data: List[Dict],
+                   existing_zones: List[Dict], constraints: Optional[Dict[str, Any]] = None) -> Dict:
+    """Run GNN prediction, reusing the cached result for identical inputs.
+
+    Cached predictions are shared between requests and must not be mutated.
+    """
+    with prediction_cache_lock:
+        predictions = prediction_cache.get(key)
+        if predictions is not None:
+            prediction_cache_stats["hits"] += 1
+            return predictions
+        prediction_cache_stats["misses"] += 1
+    
+    predictions = gnn_model.predict_optimal_zones(
+        region_coords=region_coords,
+        terrain_data=terrain_data,
+        existing_zones=existing_zones,
+        constraints=constraints
+    )
+    
+    with prediction_cache_lock:
+        prediction_cache[key] = predictions
+    
+    return predictions
+
+async def save_training_job(job_id: str, job: Dict[str, Any]):
+    """Store training job state"""
+    if redis_client is not None:
+        await redis_client.set(f"job:{job_id}", orjson.dumps(job), ex=TRAINING_JOB_TTL_SECONDS)
+    else:
+        training_jobs[job_id] = job
+
+async def load_training_job(job_id: str) -> Optional[Dict[str, Any]]:
+    """Fetch training job state, or None if unknown or expired"""
+    if redis_client is not None:
+        data = await redis_client.get(f"job:{job_id}")
+        return orjson.loads(data) if data is not None else None
+    return training_jobs.get(job_id)
+
+async def record_training_job(job_id: str, job: Dict[str, Any], training_data: Optional[Dict[str, Any]] = None):
+    """Upsert the training job row and bulk-insert any terrain samples it was given"""
+    job_values = {
+        "id": job_id,
+        "status": job.get("status"),
+        "progress": job.get("progress", 0),
+        "completion_time": job.get("completion_time"),
+        "error_message": job.get("error")
+    }
+    if training_data is not None:
+        job_values["training_data"] = training_data
+    
+    upsert = upsert_insert(TrainingJobModel).values(**job_values)
+    upsert = upsert.on_conflict_do_update(
+        index_elements=[TrainingJobModel.id],
+        set_={key: upsert.excluded[key] for key in job_values if key != "id"}
+    )
+    
+    terrain_rows = terrain_sample_rows(job_id, training_data or {})
+    
+    try:
+        async with SessionLocal() as session:
+            # The job row holds training_data, so it is committed before the terrain samples
+            await session.execute(upsert)
+            await session.commit()
+            if terrain_rows:
+                # One executemany round-trip instead of per-object ORM adds. terrain_data has no
+                # natural key, so samples are appended once per training job as submitted
+                await session.execute(insert(TerrainDataModel), terrain_rows)
+                await session.commit()
+    except Exception:
+        logger.exception("Failed to record training job %s", job_id)
+
+def terrain_sample_rows(job_id: str, training_data: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """TerrainDataModel rows for the training samples, skipping any without lat/lng coordinates"""
+    rows = []
+    for index, terrain in enumerate(training_data.get("terrain_data") or []):
+        coordinates = terrain.get("coordinates") if isinstance(terrain, dict) else None
+        if not isinstance(coordinates, dict) or "lat" not in coordinates or "lng" not in coordinates:
+            logger.warning("Training job %s: skipping terrain sample %d without lat/lng coordinates", job_id, index)
+            continue
+        rows.append({
+            "latitude": coordinates["lat"],
+            "longitude": coordinates["lng"],
+            "elevation": terrain.get("elevation"),
+            "slope": terrain.get("slope"),
+            "soil_type": terrain.get("soil_type"),
+            "water_presence": terrain.get("water_presence", False),
+            "region_id": training_data.get("region_id")
+        })
+    return rows
+
 async def train_gnn_model(job_id: str, training_data: Dict[str, Any]):
     """Background task for training the GNN model"""
+    job = await load_training_job(job_id) or {}
     try:
-        training_jobs[job_id]["status"] = "training"
+        job["status"] = "training"
+        await save_training_job(job_id, job)
+        await record_training_job(job_id, job, training_data)
         
         # Simulate training process
         for progress in range(0, 101, 10):
-            training_jobs[job_id]["progress"] = progress
+            job["progress"] = progress
+            await save_training_job(job_id, job)
             await asyncio.sleep(2)  # Simulate training time
         
-        training_jobs[job_id]["status"] = "completed"
-        training_jobs[job_id]["completion_time"] = datetime.now()
+        job["status"] = "completed"
+        job["completion_time"] = datetime.now(timezone.utc)
+        await save_training_job(job_id, job)
+        await record_training_job(job_id, job)
         
     except Exception as e:
-        training_jobs[job_id]["status"] = "failed"
-        training_jobs[job_id]["error"] = str(e)
+        job["status"] = "failed"
+        job["error"] = str(e)
+        await save_training_job(job_id, job)
+        await record_training_job(job_id, job)
 
-def calculate_performance_metrics(zones: List[Dict], region_coords: List[Dict]) -> Dict[str, float]:
+def cached_predict_batch(keys: List[bytes], inputs: List[Tuple[List[Dict], List[Dict], List[Dict]]]) -> List[Dict]:
+    """Run GNN prediction for several (region, terrain, zones) inputs, batching cache misses"""
+    results: Dict[bytes, Dict] = {}
+    misses: Dict[bytes, Tuple[List[Dict], List[Dict], List[Dict]]] = {}
+    
+    with prediction_cache_lock:
+        for key, scenario_input in zip(keys, inputs):
+            predictions = prediction_cache.get(key)
+            if predictions is not None:
+                prediction_cache_stats["hits"] += 1
+                results[key] = predictions
+            elif key not in misses:
+                prediction_cache_stats["misses"] += 1
+                misses[key] = scenario_input
+    
+    if misses:
+        region_coords_list, terrain_data_list, existing_zones_list = zip(*misses.values())
+        batch_predictions = gnn_model.predict_optimal_zones_batch(
+            list(region_coords_list), list(terrain_data_list), list(existing_zones_list)
+        )
+        
+        with prediction_cache_lock:
+            for key, predictions in zip(misses, batch_predictions):
+                prediction_cache[key] = predictions
+                results[key] = predictions
+    
+    return [results[key] for key in keys]
+
+@lru_cache(maxsize=256)
+def _polygon_area(region_key: Tuple[Tuple[float, float], ...]) -> float:
+    """Area in square meters of the polygon with the given (lat, lng) vertices"""
+    polygon = geo_processor.create_region_polygon(np.array(region_key, dtype=np.float64))
+    return geo_processor.calculate_polygon_area(polygon)
+
+def region_polygon_area(region_coords: List[Dict]) -> float:
+    """Area of the region in square meters, memoized on its coordinates"""
+    return _polygon_area(tuple((coord['lat'], coord['lng']) for coord in region_coords))
+
+def calculate_performance_metrics(zones: List[Dict], region_area: float) -> Dict[str, float]:
     """Calculate performance metrics for the optimization"""
     if not zones:
         return {"coverage": 0, "efficiency": 0, "diversity": 0}
     
     # Calculate coverage
     total_zone_area = sum(zone.get('area', 0) for zone in zones)
-    region_area = geo_processor.calculate_polygon_area(
-        geo_processor.create_region_polygon(region_coords)
-    )
     coverage = (total_zone_area / region_area * 100) if region_area > 0 else 0
     
     # Calculate efficiency (area per zone)
@@ -309,35 +532,58 @@ def calculate_performance_metrics(zones: List[Dict], region_coords: List[Dict])
         "diversity": diversity
     }
 
-def generate_optimization_insights(results: Dict) -> List[str]:
+def _threshold_band(value: float, high: float, moderate: float) -> int:
+    """Which side of the insight thresholds a score falls on: 0 above high, 1 above moderate, else 2"""
+    if value > high:
+        return 0
+    if value > moderate:
+        return 1
+    return 2
+
+def generate_optimization_insights(results: Dict) -> Tuple[str, ...]:
     """Generate insights from GNN optimization results"""
+    return _optimization_insights(
+        _threshold_band(results.get('confidence', 0), 0.8, 0.6),
+        _threshold_band(results.get('sustainability_score', 0), 0.8, 0.6)
+    )
+
+@lru_cache(maxsize=16)
+def _optimization_insights(confidence_band: int, sustainability_band: int) -> Tuple[str, ...]:
+    """Insights for a confidence/sustainability band pair, built once per pair"""
     insights = []
     
-    confidence = results.get('confidence', 0)
-    if confidence > 0.8:
+    if confidence_band == 0:
         insights.append("High confidence in optimal zone placement")
-    elif confidence > 0.6:
+    elif confidence_band == 1:
         insights.append("Moderate confidence - consider additional constraints")
     else:
         insights.append("Low confidence - more data needed for better optimization")
     
-    sustainability = results.get('sustainability_score', 0)
-    if sustainability > 0.8:
+    if sustainability_band == 0:
         insights.append("Excellent sustainability potential identified")
-    elif sustainability > 0.6:
+    elif sustainability_band == 1:
         insights.append("Good sustainability with room for improvement")
     
     insights.append("GNN identified optimal spatial relationships between zones")
     insights.append("Machine learning enhanced traditional planning approaches")
     
-    return insights
+    return tuple(insights)
 
-def generate_gnn_recommendations(results: Dict, goals: Optional[List[str]] = None) -> List[str]:
+# Goals that change the generated recommendations, in the order they are reported
+RECOMMENDATION_GOALS = ("sustainability", "accessibility", "connectivity")
+
+def generate_gnn_recommendations(results: Dict, goals: Optional[List[str]] = None) -> Tuple[str, ...]:
     """Generate recommendations based on GNN results and goals"""
-    recommendations = []
-    
     if not goals:
-        goals = ["sustainability", "accessibility", "connectivity"]
+        return _gnn_recommendations(RECOMMENDATION_GOALS)
+    
+    # Only the recognised goals matter, so every request maps onto one of a few cache keys
+    return _gnn_recommendations(tuple(goal for goal in RECOMMENDATION_GOALS if goal in goals))
+
+@lru_cache(maxsize=16)
+def _gnn_recommendations(goals: Tuple[str, ...]) -> Tuple[str, ...]:
+    """Recommendations for a canonical goal tuple, built once per tuple"""
+    recommendations = []
     
     if "sustainability" in goals:
         recommendations.append("Prioritize native species selection for long-term sustainability")
@@ -355,128 +601,80 @@ def generate_gnn_recommendations(results: Dict, goals: Optional[List[str]] = Non
         "Integrate smart city sensors for adaptive management"
     ])
     
-    return recommendations
-
-def predict_air_quality_impact(predictions: Dict, existing_zones: List[Dict]) -> float:
-    """Predict air quality improvement using GNN results"""
-    optimal_zones = predictions.get('optimal_zones', [])
-    total_area = sum(zone.get('area', 0) for zone in optimal_zones + existing_zones)
-    
-    # Trees filter approximately 48 pounds of CO2 per year per tree
-    # Estimate trees per area and calculate impact
-    estimated_trees = total_area / 100  # Rough estimate
-    co2_reduction = estimated_trees * 48 * 0.453592  # Convert to kg
-    
-    return min(100, co2_reduction / 1000 * 20)  # Normalize to 0-100
-
-def predict_carbon_sequestration(predictions: Dict) -> float:
-    """Predict carbon sequestration potential"""
-    optimal_zones = predictions.get('optimal_zones', [])
-    
-    sequestration_rates = {
-        'park': 2.5,    # tons CO2/hectare/year
-        'garden': 1.5,
-        'forest': 4.0,
-        'wetland': 3.0
-    }
-    
-    total_sequestration = 0
-    for zone in optimal_zones:
-        zone_type = zone.get('type', 'park')
-        area_hectares = zone.get('area', 0) / 10000  # Convert sq m to hectares
-        rate = sequestration_rates.get(zone_type, 2.0)
-        total_sequestration += area_hectares * rate
-    
-    return min(100, total_sequestration * 10)  # Normalize
+    return tuple(recommendations)
 
-def predict_biodiversity_impact(predictions: Dict) -> float:
-    """Predict biodiversity enhancement"""
-    optimal_zones = predictions.get('optimal_zones', [])
-    
-    biodiversity_scores = {
-        'park': 60,
-        'garden': 40,
-        'forest': 90,
-        'wetland': 85
-    }
-    
-    if not optimal_zones:
-        return 0
-    
-    weighted_score = sum(
-        biodiversity_scores.get(zone.get('type', 'park'), 50) * zone.get('area', 0)
-        for zone in optimal_zones
+def _zones_to_arrays(zones: List[Dict]) -> Tuple[np.ndarray, np.ndarray]:
+    """Split zone dicts into type index and area arrays"""
+    type_lookup = ZONE_TYPE_INDEX.get
+    type_idx = np.fromiter(
+        (type_lookup(zone.get('type', 'park'), OTHER_ZONE_INDEX) for zone in zones),
+        dtype=np.int8, count=len(zones)
     )
-    total_area = sum(zone.get('area', 0) for zone in optimal_zones)
-    
-    return weighted_score / total_area if total_area > 0 else 0
+    areas = np.fromiter((zone.get('area', 0) for zone in zones), dtype=np.float64, count=len(zones))
+    return type_idx, areas
 
-def predict_water_management(predictions: Dict, terrain_data: List[Dict]) -> float:
-    """Predict water management efficiency"""
+def _impact_totals(type_idx: np.ndarray, areas: np.ndarray) -> np.ndarray:
+    """Rate-weighted area totals, total area and wetland count for the zones"""
+    areas_by_type = np.bincount(type_idx, weights=areas, minlength=IMPACT_RATES.shape[1])
+    wetland_count = np.count_nonzero(type_idx == ZONE_TYPE_INDEX['wetland'])
+    return np.concatenate((IMPACT_RATES @ areas_by_type, (areas_by_type.sum(), wetland_count)))
+
+def compute_all_impacts(predictions: Dict, existing_zones: List[Dict]) -> Dict[str, float]:
+    """Predict every environmental impact score from one pass over the zones"""
     optimal_zones = predictions.get('optimal_zones', [])
+    type_idx, areas = _zones_to_arrays(optimal_zones)
     
-    # Green infrastructure helps with stormwater management
-    total_area = sum(zone.get('area', 0) for zone in optimal_zones)
-    base_score = min(80, total_area / 10000 * 60)
+    # Weighted totals and zone counts, reused by every score below
+    totals = _impact_totals(type_idx, areas)
+    sequestration, cooling, noise_db, biodiversity_weight, total_area, wetland_count = totals.tolist()
     
-    # Bonus for wetlands and water-adjacent zones
-    water_bonus = 0
-    for zone in optimal_zones:
-        if zone.get('type') == 'wetland':
-            water_bonus += 10
+    # Trees filter approximately 48 pounds of CO2 per year per tree
+    # Estimate trees per area (rough estimate) and convert to kg
+    existing_area = sum(zone.get('area', 0) for zone in existing_zones)
+    estimated_trees = (total_area + existing_area) / 100
+    co2_reduction = estimated_trees * 48 * 0.453592
+    air = min(100, co2_reduction / 1000 * 20)  # Normalize to 0-100
     
-    return min(100, base_score + water_bonus)
-
-def predict_heat_reduction(predictions: Dict) -> float:
-    """Predict urban heat island reduction"""
-    optimal_zones = predictions.get('optimal_zones', [])
+    # Convert sq m to hectares
+    carbon = min(100, sequestration / 10000 * 10)  # Normalize
     
-    cooling_effects = {
-        'park': 3.0,    # degrees Celsius reduction
-        'garden': 2.0,
-        'forest': 4.0,
-        'wetland': 3.5
-    }
+    biodiversity = biodiversity_weight / total_area if total_area > 0 else 0
     
-    total_cooling = sum(
-        cooling_effects.get(zone.get('type', 'park'), 2.5) * zone.get('area', 0) / 1000
-        for zone in optimal_zones
-    )
+    # Green infrastructure helps with stormwater management, bonus for wetlands
+    water = min(100, min(80, total_area / 10000 * 60) + int(wetland_count) * 10)
     
-    return min(100, total_cooling * 5)  # Normalize
-
-def predict_noise_reduction(predictions: Dict) -> float:
-    """Predict noise pollution reduction"""
-    optimal_zones = predictions.get('optimal_zones', [])
+    heat = min(100, cooling / 1000 * 5)  # Normalize
+    noise = min(100, noise_db / 1000 * 8)  # Normalize
     
-    noise_reduction_db = {
-        'park': 5,      # decibel reduction
-        'garden': 3,
-        'forest': 8,
-        'wetland': 4
+    return {
+        "air_quality_improvement": air,
+        "carbon_sequestration_potential": carbon,
+        "biodiversity_enhancement": biodiversity,
+        "water_management_efficiency": water,
+        "heat_island_reduction": heat,
+        "noise_pollution_reduction": noise,
+        "overall_environmental_score": (air + carbon + biodiversity + water + heat + noise) / 6.0
     }
-    
-    total_reduction = sum(
-        noise_reduction_db.get(zone.get('type', 'park'), 4) * zone.get('area', 0) / 1000
-        for zone in optimal_zones
-    )
-    
-    return min(100, total_reduction * 8)  # Normalize
 
-def rank_scenarios(scenarios: List[Dict]) -> List[Dict]:
-    """Rank scenarios based on multiple criteria"""
+def rank_scenarios(scenarios: List[Dict], top_k: Optional[int] = None) -> List[Dict]:
+    """Rank scenarios based on multiple criteria, optionally keeping only the best top_k"""
     # Calculate composite score for each scenario
-    for scenario in scenarios:
-        composite_score = (
-            scenario['sustainability_score'] * 0.4 +
-            scenario['accessibility_score'] * 0.3 +
-            scenario['connectivity_score'] * 0.2 +
-            scenario['confidence'] * 100 * 0.1
-        )
+    count = len(scenarios)
+    scores = (
+        np.fromiter((s['sustainability_score'] for s in scenarios), dtype=np.float64, count=count) * 0.4 +
+        np.fromiter((s['accessibility_score'] for s in scenarios), dtype=np.float64, count=count) * 0.3 +
+        np.fromiter((s['connectivity_score'] for s in scenarios), dtype=np.float64, count=count) * 0.2 +
+        np.fromiter((s['confidence'] for s in scenarios), dtype=np.float64, count=count) * 100 * 0.1
+    )
+    for scenario, composite_score in zip(scenarios, scores.tolist()):
         scenario['composite_score'] = composite_score
     
-    # Sort by composite score (descending)
-    return sorted(scenarios, key=lambda x: x['composite_score'], reverse=True)
+    # Order by composite score (descending), ties keep their input order
+    if top_k is not None and top_k < count:
+        order = heapq.nlargest(top_k, range(count), key=scores.__getitem__)
+    else:
+        order = np.argsort(-scores, kind='stable').tolist()
+    return [scenarios[i] for i in order]
 
 def generate_comparison_insights(scenarios: List[Dict]) -> Dict[str, Any]:
     """Generate insights from scenario comparison"""
@@ -1,35 +1,73 @@
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Query
+from fastapi.responses import ORJSONResponse
 from typing import List, Optional
+import os
 import uuid
 from datetime import datetime
-from sqlalchemy.orm import Session
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from cachetools import TTLCache
 
-from app.models.schemas import Project, ProjectCreate, Scenario
+from app.models.schemas import Project, ProjectCreate, ProjectUpdate, Scenario
 from app.config.database import get_db_session, ProjectModel
+from app.utils.geospatial import coords_to_array
 
 router = APIRouter()
 
+# Opt-in short-lived cache of single-project responses for polling clients. Writes evict the
+# entry only on the worker that handled them, so with several workers other workers may
+# serve a stale copy for up to the TTL; off by default to keep read-after-write.
+PROJECT_CACHE_TTL_SECONDS = int(os.getenv("PROJECT_CACHE_TTL_SECONDS", "0"))
+project_cache = TTLCache(maxsize=256, ttl=PROJECT_CACHE_TTL_SECONDS)
+
+# Page size bounds for project listings
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
 @router.get("/", response_model=List[dict])
-async def get_all_projects(db: Session = Depends(get_db_session)):
-    """Get all projects"""
-    projects = db.query(ProjectModel).order_by(ProjectModel.created_at.desc()).all()
+async def get_all_projects(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    offset: int = Query(0, ge=0),
+    db: AsyncSession = Depends(get_db_session)
+):
+    """Get a page of projects, newest first.
+
+    The listing leaves out the scenario JSON; fetch a single project for the full record.
+    """
+    # Read-only listing: select plain columns so rows come back as tuples, not ORM instances
+    result = await db.execute(
+        select(
+            ProjectModel.id,
+            ProjectModel.name,
+            ProjectModel.region,
+            ProjectModel.status,
+            ProjectModel.date,
+        )
+        .order_by(ProjectModel.created_at.desc(), ProjectModel.id)
+        .limit(limit)
+        .offset(offset)
+    )
     return [{
         "id": p.id,
         "name": p.name,
         "region": p.region,
         "status": p.status,
-        "date": p.date,
-        "scenario": p.scenario_data
-    } for p in projects]
+        "date": p.date
+    } for p in result.all()]
 
 @router.get("/{project_id}")
-async def get_project(project_id: str, db: Session = Depends(get_db_session)):
+async def get_project(project_id: str, db: AsyncSession = Depends(get_db_session)):
     """Get a specific project by ID"""
-    project = db.query(ProjectModel).filter(ProjectModel.id == project_id).first()
+    cached = project_cache.get(project_id)
+    if cached is not None:
+        return cached
+    
+    project = await db.get(ProjectModel, project_id)
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
     
-    return {
+    response = {
         "id": project.id,
         "name": project.name,
         "region": project.region,
@@ -37,27 +75,29 @@ async def get_project(project_id: str, db: Session = Depends(get_db_session)):
         "date": project.date,
         "scenario": project.scenario_data
     }
+    if PROJECT_CACHE_TTL_SECONDS > 0:
+        project_cache[project_id] = response
+    return response
 
 @router.post("/")
-async def create_project(project_data: dict, db: Session = Depends(get_db_session)):
+async def create_project(project_data: ProjectCreate, db: AsyncSession = Depends(get_db_session)):
     """Create a new project"""
     project_id = str(uuid.uuid4())
     
-    # Ensure scenario has an ID
-    if "scenario" in project_data and not project_data["scenario"].get("id"):
-        project_data["scenario"]["id"] = str(uuid.uuid4())
+    # The scenario was validated against the Scenario schema; store its JSON form
+    scenario = project_data.scenario
     
     db_project = ProjectModel(
         id=project_id,
-        name=project_data["name"],
-        region=project_data["region"],
-        status=project_data.get("status", "draft"),
-        scenario_data=project_data.get("scenario", {})
+        name=project_data.name,
+        region=project_data.region,
+        status=project_data.status.value,
+        scenario_data=scenario.model_dump(mode="json") if scenario else {}
     )
     
     db.add(db_project)
-    db.commit()
-    db.refresh(db_project)
+    await db.commit()
+    await db.refresh(db_project)
     
     return {
         "id": db_project.id,
@@ -69,19 +109,22 @@ async def create_project(project_data: dict, db: Session = Depends(get_db_sessio
     }
 
 @router.put("/{project_id}")
-async def update_project(project_id: str, project_data: dict, db: Session = Depends(get_db_session)):
+async def update_project(project_id: str, project_data: ProjectUpdate, db: AsyncSession = Depends(get_db_session)):
     """Update an existing project"""
-    project = db.query(ProjectModel).filter(ProjectModel.id == project_id).first()
+    project = await db.get(ProjectModel, project_id)
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
     
-    project.name = project_data.get("name", project.name)
-    project.region = project_data.get("region", project.region)
-    project.status = project_data.get("status", project.status)
-    project.scenario_data = project_data.get("scenario", project.scenario_data)
+    # Only the fields the client sent are written; an explicit null clears a nullable field
+    changes = project_data.model_dump(mode="json", exclude_unset=True)
+    if "scenario" in changes:
+        changes["scenario_data"] = changes.pop("scenario")
+    for field, value in changes.items():
+        setattr(project, field, value)
     
-    db.commit()
-    db.refresh(project)
+    await db.commit()
+    project_cache.pop(project_id, None)
+    await db.refresh(project)
     
     return {
         "id": project.id,
@@ -93,14 +136,15 @@ async def update_project(project_id: str, project_data: dict, db: Session = Depe
     }
 
 @router.delete("/{project_id}")
-async def delete_project(project_id: str, db: Session = Depends(get_db_session)):
+async def delete_project(project_id: str, db: AsyncSession = Depends(get_db_session)):
     """Delete a project"""
-    project = db.query(ProjectModel).filter(ProjectModel.id == project_id).first()
+    project = await db.get(ProjectModel, project_id)
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
     
-    db.delete(project)
-    db.commit()
+    await db.delete(project)
+    await db.commit()
+    project_cache.pop(project_id, None)
     return {"message": "Project deleted successfully"}
 
 @router.post("/{project_id}/scenarios", response_model=Project)
@@ -115,25 +159,38 @@ async def add_scenario_to_project(project_id: str, scenario: Scenario):
     
     return project
 
-@router.get("/{project_id}/export")
-async def export_project(project_id: str, format: str = "json"):
+def _polygon_ring(coordinates: List[dict]) -> List[List[float]]:
+    """Closed GeoJSON ring of [lng, lat] pairs from a list of {'lat', 'lng'} dicts"""
+    points = coords_to_array(coordinates)
+    ring = np.empty((len(points) + 1, 2), dtype=np.float64)
+    ring[:-1] = points[:, ::-1]
+    ring[-1] = ring[0]  # Close the polygon
+    return ring.tolist()
+
+@router.get("/{project_id}/export", response_class=ORJSONResponse)
+async def export_project(project_id: str, format: str = "json", db: AsyncSession = Depends(get_db_session)):
     """Export project data in various formats"""
-    if project_id not in projects_db:
+    project = await db.get(ProjectModel, project_id)
+    if not project:
         raise HTTPException(status_code=404, detail="Project not found")
     
-    project = projects_db[project_id]
+    scenario = project.scenario_data or {}
     
     if format.lower() == "json":
-        return project.dict()
+        return {
+            "id": project.id,
+            "name": project.name,
+            "region": project.region,
+            "status": project.status,
+            "date": project.date,
+            "scenario": scenario
+        }
     elif format.lower() == "geojson":
         # Convert to GeoJSON format
         features = []
         
         # Add region as a feature
-        if project.scenario.region:
-            region_coords = [[coord.lng, coord.lat] for coord in project.scenario.region]
-            region_coords.append(region_coords[0])  # Close the polygon
-            
+        if scenario.get("region"):
             features.append({
                 "type": "Feature",
                 "properties": {
@@ -142,34 +199,32 @@ async def export_project(project_id: str, format: str = "json"):
                 },
                 "geometry": {
                     "type": "Polygon",
-                    "coordinates": [region_coords]
+                    "coordinates": [_polygon_ring(scenario["region"])]
                 }
             })
         
         # Add green zones as features
-        for zone in project.scenario.green_zones:
-            if zone.coordinates:
-                zone_coords = [[coord.lng, coord.lat] for coord in zone.coordinates]
-                zone_coords.append(zone_coords[0])  # Close the polygon
-                
+        for zone in scenario.get("green_zones", []):
+            if zone.get("coordinates"):
                 features.append({
                     "type": "Feature",
                     "properties": {
-                        "name": zone.name,
-                        "type": zone.type,
-                        "area": zone.area,
-                        "id": zone.id
+                        "name": zone.get("name"),
+                        "type": zone.get("type"),
+                        "area": zone.get("area"),
+                        "id": zone.get("id")
                     },
                     "geometry": {
                         "type": "Polygon",
-                        "coordinates": [zone_coords]
+                        "coordinates": [_polygon_ring(zone["coordinates"])]
                     }
                 })
         
-        return {
+        # Encoded straight by orjson, bypassing FastAPI's jsonable_encoder walk over every vertex
+        return ORJSONResponse({
             "type": "FeatureCollection",
             "features": features
-        }
+        })
     else:
         raise HTTPException(status_code=400, detail="Unsupported export format")
 
@@ -177,18 +232,37 @@ async def export_project(project_id: str, format: str = "json"):
 async def search_projects(
     query: Optional[str] = None,
     region: Optional[str] = None,
-    status: Optional[str] = None
+    status: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    offset: int = Query(0, ge=0),
+    db: AsyncSession = Depends(get_db_session)
 ):
-    """Search projects by various criteria"""
-    results = list(projects_db.values())
-    
+    """Search projects by various criteria, one page at a time, newest first"""
+    # Filter in the database; case-insensitive substring matches are served by the trigram indexes
+    stmt = select(
+        ProjectModel.id,
+        ProjectModel.name,
+        ProjectModel.region,
+        ProjectModel.status,
+        ProjectModel.date,
+        ProjectModel.scenario_data,
+    ).order_by(ProjectModel.created_at.desc(), ProjectModel.id).limit(limit).offset(offset)
+
     if query:
-        results = [p for p in results if query.lower() in p.name.lower()]
+        stmt = stmt.where(ProjectModel.name.icontains(query, autoescape=True))
     
     if region:
-        results = [p for p in results if region.lower() in p.region.lower()]
+        stmt = stmt.where(ProjectModel.region.icontains(region, autoescape=True))
     
     if status:
-        results = [p for p in results if p.status == status]
+        stmt = stmt.where(ProjectModel.status == status)
     
-    return results
\ No newline at end of file
+    result = await db.execute(stmt)
+    return [{
+        "id": p.id,
+        "name": p.name,
+        "region": p.region,
+        "status": p.status,
+        "date": p.date,
+        "scenario": p.scenario_data
+    } for p in result.all()]
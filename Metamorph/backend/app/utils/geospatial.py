@@ -6,117 +6,275 @@ import rasterio
 from rasterio.features import rasterize
 from rasterio.transform import from_bounds
 import numpy as np
-from typing import List, Dict, Tuple, Optional
+import shapely
+import threading
+from functools import lru_cache
+from cachetools import LRUCache
+from pyproj import CRS, Geod
+from scipy.spatial import cKDTree
+from typing import List, Dict, Tuple, Optional, Union
 import folium
-from geopy.distance import geodesic
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional, the NumPy path is used without it
+    njit = None
+
+# WGS84 ellipsoid for geodesic distances (Karney's algorithm, compiled in PROJ)
+WGS84_GEOD = Geod(ellps='WGS84')
+
+def geodesic_vec(lat1, lng1, lat2, lng2) -> np.ndarray:
+    """Geodesic distance in meters between coordinates given in degrees, broadcasting over arrays"""
+    lat1, lng1, lat2, lng2 = np.broadcast_arrays(lat1, lng1, lat2, lng2)
+    _, _, distance = WGS84_GEOD.inv(lng1.ravel(), lat1.ravel(), lng2.ravel(), lat2.ravel())
+    return np.asarray(distance).reshape(lat1.shape)
+
+def equirectangular_vec(lat1, lng1, lat2, lng2) -> np.ndarray:
+    """Flat-earth distance in meters between nearby coordinates in degrees, broadcasting over arrays"""
+    dlat = (lat2 - lat1) * 111000  # Approximate meters per degree
+    dlng = (lng2 - lng1) * 111000 * np.cos(np.radians((lat1 + lat2) / 2))
+    return np.hypot(dlat, dlng)
+
+def coords_to_array(coordinates: List[Dict]) -> np.ndarray:
+    """(N, 2) float64 array of (lat, lng) rows from a list of {'lat', 'lng'} dicts"""
+    if isinstance(coordinates, np.ndarray):
+        return coordinates
+    return np.fromiter(
+        (value for coord in coordinates for value in (coord['lat'], coord['lng'])),
+        dtype=np.float64, count=2 * len(coordinates)
+    ).reshape(-1, 2)
+
+def zone_centers(green_zones: List[Dict]) -> Tuple[np.ndarray, np.ndarray]:
+    """Mean lat/lng of each zone that has coordinates, as two arrays"""
+    centers = [
+        coords_to_array(zone['coordinates']).mean(axis=0)
+        for zone in green_zones
+        if zone.get('coordinates')
+    ]
+    centers = np.array(centers, dtype=np.float64).reshape(-1, 2)
+    return centers[:, 0], centers[:, 1]
+
+# Folium fill colors per zone type
+ZONE_COLORS = {
+    'park': 'green',
+    'garden': 'lightgreen',
+    'forest': 'darkgreen',
+    'wetland': 'blue'
+}
+
+# Synthetic soil types, picked per elevation band (<20m, <60m, above) from a pair of candidates
+SOIL_TYPES = ['clay', 'loam', 'sand', 'rocky']
+SOIL_CHOICES = np.array([[0, 1], [1, 2], [3, 2]], dtype=np.int8)
+
+# Flat record layout for terrain points passed between internal stages
+TERRAIN_DTYPE = np.dtype([
+    ('lat', np.float64), ('lng', np.float64), ('elevation', np.float64),
+    ('slope', np.float64), ('soil_type', 'U5'), ('water_presence', np.bool_)
+])
+
+# splitmix64 constants for the per-point terrain noise stream
+SPLITMIX_GAMMA = np.uint64(0x9E3779B97F4A7C15)
+SPLITMIX_MUL1 = np.uint64(0xBF58476D1CE4E5B9)
+SPLITMIX_MUL2 = np.uint64(0x94D049BB133111EB)
+
+def _splitmix64(z: np.ndarray) -> np.ndarray:
+    """splitmix64 output mix, a bijection on uint64 with full avalanche"""
+    z = (z ^ (z >> np.uint64(30))) * SPLITMIX_MUL1
+    z = (z ^ (z >> np.uint64(27))) * SPLITMIX_MUL2
+    return z ^ (z >> np.uint64(31))
+
+def _terrain_seeds(lats: np.ndarray, lngs: np.ndarray) -> np.ndarray:
+    """Per-point noise seeds from the coordinate bits, so terrain is a pure function of (lat, lng)"""
+    lat_bits = np.ascontiguousarray(lats, dtype=np.float64).view(np.uint64)
+    lng_bits = np.ascontiguousarray(lngs, dtype=np.float64).view(np.uint64)
+    # Mixing lng before combining keeps grid points with correlated coordinates from colliding
+    return _splitmix64(lat_bits ^ _splitmix64(lng_bits))
+
+def _terrain_uniforms(seeds: np.ndarray, count: int) -> np.ndarray:
+    """count uniform draws in [0, 1) per seed from a counter-based splitmix64 stream, shape (count, N)"""
+    # Draw k of a seed is mix(seed + (k + 1) * gamma), so every draw is computed at once
+    z = _splitmix64(seeds[None, :] + SPLITMIX_GAMMA * np.arange(1, count + 1, dtype=np.uint64)[:, None])
+    return (z >> np.uint64(11)) * 2.0 ** -53
+
+def _synthesize_terrain(lats: np.ndarray, lngs: np.ndarray,
+                        seeds: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Elevation, slope, soil type index and water presence for each point"""
+    u = _terrain_uniforms(seeds, 6)
+    
+    # Elevation based on distance from center (simulate hills), with Box-Muller noise
+    base_elevation = np.abs(np.sin(lats * 10) * np.cos(lngs * 10)) * 100
+    elevation = base_elevation + 10 * np.sqrt(-2 * np.log(1 - u[0])) * np.cos(2 * np.pi * u[1])
+    
+    # Slope based on elevation variation
+    slope_noise = 5 * np.sqrt(-2 * np.log(1 - u[2])) * np.cos(2 * np.pi * u[3])
+    slope = np.minimum(45, np.abs(elevation / 10 + slope_noise))
+    
+    # Soil type based on elevation and location
+    band = (elevation >= 20).astype(np.int8) + (elevation >= 60)
+    soil_idx = SOIL_CHOICES[band, (u[4] >= 0.5).astype(np.int8)]
+    
+    # Water presence more likely in low elevation areas
+    water_presence = u[5] < np.maximum(0.1, 0.8 - (elevation / 100))
+    
+    return elevation, slope, soil_idx, water_presence
+
+if njit is not None:
+    @njit(cache=True)
+    def _synthesize_terrain_jit(lats, lngs, seeds, soil_choices):
+        """Compiled equivalent of _synthesize_terrain, one point per iteration"""
+        n = lats.shape[0]
+        elevation = np.empty(n)
+        slope = np.empty(n)
+        soil_idx = np.empty(n, dtype=np.int8)
+        water_presence = np.empty(n, dtype=np.bool_)
+        
+        for p in range(n):
+            u = np.empty(6)
+            for k in range(6):
+                z = seeds[p] + np.uint64(0x9E3779B97F4A7C15) * np.uint64(k + 1)
+                z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+                z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+                z ^= z >> np.uint64(31)
+                u[k] = (z >> np.uint64(11)) * 2.0 ** -53
+            
+            base_elevation = abs(np.sin(lats[p] * 10) * np.cos(lngs[p] * 10)) * 100
+            elevation[p] = base_elevation + 10 * np.sqrt(-2 * np.log(1 - u[0])) * np.cos(2 * np.pi * u[1])
+            slope_noise = 5 * np.sqrt(-2 * np.log(1 - u[2])) * np.cos(2 * np.pi * u[3])
+            slope[p] = min(45.0, abs(elevation[p] / 10 + slope_noise))
+            
+            band = 0 if elevation[p] < 20 else (1 if elevation[p] < 60 else 2)
+            soil_idx[p] = soil_choices[band, 0 if u[4] < 0.5 else 1]
+            water_presence[p] = u[5] < max(0.1, 0.8 - (elevation[p] / 100))
+        
+        return elevation, slope, soil_idx, water_presence
+
+@lru_cache(maxsize=256)
+def _projected_area(polygon_wkb: bytes, crs: str, utm_crs: str) -> float:
+    """Area in square meters of the polygon projected into the given UTM zone, memoized per geometry"""
+    # CRSs are passed as authority strings: hashing a CRS object serializes it to WKT on every lookup
+    gdf = gpd.GeoDataFrame([1], geometry=[shapely.from_wkb(polygon_wkb)], crs=crs)
+    gdf_projected = gdf.to_crs(CRS.from_user_input(utm_crs))
+    
+    return float(gdf_projected.geometry.area.iloc[0])
 
 class GeospatialProcessor:
     """Handle geospatial operations for urban planning"""
     
     def __init__(self):
         self.crs = "EPSG:4326"  # WGS84
+        # Bounded: a long-lived processor sees a new 0.1 degree cell for every new region
+        self._utm_cache: LRUCache = LRUCache(maxsize=1024)
+        self._utm_cache_lock = threading.Lock()  # Shared by requests running in the threadpool
     
-    def create_region_polygon(self, coordinates: List[Dict]) -> Polygon:
-        """Create a Shapely polygon from coordinate list"""
+    def create_region_polygon(self, coordinates: Union[List[Dict], np.ndarray]) -> Polygon:
+        """Create a Shapely polygon from a coordinate list or (N, 2) lat/lng array"""
         if len(coordinates) < 3:
             raise ValueError("Need at least 3 coordinates to create a polygon")
         
-        coords = [(coord['lng'], coord['lat']) for coord in coordinates]
-        return Polygon(coords)
+        return Polygon(coords_to_array(coordinates)[:, ::-1])
+    
+    def _utm_crs(self, polygon: Polygon) -> str:
+        """UTM CRS code ('EPSG:326xx') for the polygon, looked up once per 0.1 degree cell of its lower-left corner"""
+        minx, miny, _, _ = polygon.bounds
+        key = (round(minx, 1), round(miny, 1))
+        with self._utm_cache_lock:
+            utm_crs = self._utm_cache.get(key)
+        if utm_crs is None:
+            # Project to appropriate UTM zone for area calculation
+            utm_crs = gpd.GeoSeries([polygon], crs=self.crs).estimate_utm_crs().to_string()
+            with self._utm_cache_lock:
+                self._utm_cache[key] = utm_crs
+        return utm_crs
     
     def calculate_polygon_area(self, polygon: Polygon) -> float:
         """Calculate area in square meters using geodesic calculations"""
         if polygon.is_empty:
             return 0.0
         
-        # Convert to GeoDataFrame for accurate area calculation
-        gdf = gpd.GeoDataFrame([1], geometry=[polygon], crs=self.crs)
-        
-        # Project to appropriate UTM zone for area calculation
-        utm_crs = gdf.estimate_utm_crs()
-        gdf_projected = gdf.to_crs(utm_crs)
-        
-        return float(gdf_projected.geometry.area.iloc[0])
+        return _projected_area(polygon.wkb, self.crs, self._utm_crs(polygon))
     
-    def calculate_coverage_percentage(self, green_zones: List[Dict], region_coords: List[Dict]) -> float:
+    def calculate_coverage_percentage(self, green_zones: List[Dict],
+                                      region_coords: Union[List[Dict], np.ndarray]) -> float:
         """Calculate green space coverage percentage"""
-        if not green_zones or not region_coords:
+        if not green_zones or len(region_coords) == 0:
             return 0.0
         
         # Create region polygon
         region_polygon = self.create_region_polygon(region_coords)
-        region_area = self.calculate_polygon_area(region_polygon)
+        if region_polygon.is_empty:
+            return 0.0
+        utm_crs = self._utm_crs(region_polygon)
+        region_area = _projected_area(region_polygon.wkb, self.crs, utm_crs)
         
         if region_area == 0:
             return 0.0
         
-        # Calculate total green zone area
-        total_green_area = 0.0
-        for zone in green_zones:
-            if 'coordinates' in zone and len(zone['coordinates']) >= 3:
-                zone_polygon = self.create_region_polygon(zone['coordinates'])
-                zone_area = self.calculate_polygon_area(zone_polygon)
-                total_green_area += zone_area
+        # Calculate total green zone area from the union of the zones, so overlaps count once,
+        # projected a single time into the region's UTM zone
+        zone_polygons = [
+            self.create_region_polygon(zone['coordinates'])
+            for zone in green_zones
+            if 'coordinates' in zone and len(zone['coordinates']) >= 3
+        ]
+        if not zone_polygons:
+            return 0.0
+        merged_zones = unary_union(shapely.make_valid(zone_polygons))
+        total_green_area = float(gpd.GeoSeries([merged_zones], crs=self.crs).to_crs(utm_crs).area.iloc[0])
         
         return (total_green_area / region_area) * 100
     
     def generate_terrain_grid(self, region_coords: List[Dict], grid_size: int = 50) -> List[Dict]:
         """Generate a grid of terrain data points within the region"""
+        return self.terrain_records_to_dicts(self.generate_terrain_records(region_coords, grid_size))
+    
+    def generate_terrain_records(self, region_coords: Union[List[Dict], np.ndarray],
+                                 grid_size: int = 50) -> np.recarray:
+        """Generate the terrain grid as a record array with TERRAIN_DTYPE fields"""
         region_polygon = self.create_region_polygon(region_coords)
         bounds = region_polygon.bounds  # (minx, miny, maxx, maxy)
         
-        terrain_points = []
-        
-        # Create grid
+        # Create grid, lng along the outer axis as the points are reported
         x_step = (bounds[2] - bounds[0]) / grid_size
         y_step = (bounds[3] - bounds[1]) / grid_size
-        
-        for i in range(grid_size):
-            for j in range(grid_size):
-                lng = bounds[0] + i * x_step
-                lat = bounds[1] + j * y_step
-                point = Point(lng, lat)
-                
-                if region_polygon.contains(point):
-                    # Generate synthetic terrain data
-                    terrain_data = self._generate_synthetic_terrain(lat, lng)
-                    terrain_points.append(terrain_data)
-        
-        return terrain_points
+        lngs, lats = np.meshgrid(
+            bounds[0] + np.arange(grid_size) * x_step,
+            bounds[1] + np.arange(grid_size) * y_step,
+            indexing='ij'
+        )
+        lngs, lats = lngs.ravel(), lats.ravel()
+        
+        # One batched containment check instead of a Point per grid cell
+        inside = shapely.contains_xy(region_polygon, lngs, lats)
+        return self._generate_synthetic_terrain(lats[inside], lngs[inside])
     
-    def _generate_synthetic_terrain(self, lat: float, lng: float) -> Dict:
-        """Generate synthetic terrain data for a point"""
-        # Use coordinates to create deterministic but varied terrain
-        np.random.seed(int((lat + lng) * 10000) % 2**32)
-        
-        # Elevation based on distance from center (simulate hills)
-        base_elevation = abs(np.sin(lat * 10) * np.cos(lng * 10)) * 100
-        elevation = base_elevation + np.random.normal(0, 10)
-        
-        # Slope based on elevation variation
-        slope = min(45, abs(np.random.normal(elevation / 10, 5)))
-        
-        # Soil type based on elevation and location
-        if elevation < 20:
-            soil_types = ['clay', 'loam']
-        elif elevation < 60:
-            soil_types = ['loam', 'sand']
+    def _generate_synthetic_terrain(self, lats: np.ndarray, lngs: np.ndarray) -> np.recarray:
+        """Generate synthetic terrain data for each point"""
+        seeds = _terrain_seeds(lats, lngs)
+        if njit is not None:
+            elevation, slope, soil_idx, water_presence = _synthesize_terrain_jit(lats, lngs, seeds, SOIL_CHOICES)
         else:
-            soil_types = ['rocky', 'sand']
-        
-        soil_type = np.random.choice(soil_types)
+            elevation, slope, soil_idx, water_presence = _synthesize_terrain(lats, lngs, seeds)
         
-        # Water presence more likely in low elevation areas
-        water_probability = max(0.1, 0.8 - (elevation / 100))
-        water_presence = np.random.random() < water_probability
-        
-        return {
-            'coordinates': {'lat': lat, 'lng': lng},
-            'elevation': float(elevation),
-            'slope': float(slope),
-            'soil_type': soil_type,
-            'water_presence': water_presence
-        }
+        return np.rec.fromarrays(
+            (lats, lngs, elevation, slope, np.asarray(SOIL_TYPES)[soil_idx], water_presence),
+            dtype=TERRAIN_DTYPE
+        )
+    
+    def terrain_records_to_dicts(self, records: np.recarray) -> List[Dict]:
+        """Terrain records in the JSON layout used by the API"""
+        return [
+            {
+                'coordinates': {'lat': lat, 'lng': lng},
+                'elevation': elev,
+                'slope': slp,
+                'soil_type': soil,
+                'water_presence': water
+            }
+            for lat, lng, elev, slp, soil, water in zip(
+                records.lat.tolist(), records.lng.tolist(), records.elevation.tolist(),
+                records.slope.tolist(), records.soil_type.tolist(), records.water_presence.tolist()
+            )
+        ]
     
     def calculate_accessibility_score(self, green_zones: List[Dict], 
                                     population_centers: List[Dict] = None) -> float:
@@ -128,33 +286,19 @@ class GeospatialProcessor:
         if not population_centers:
             population_centers = self._generate_population_centers(green_zones)
         
-        total_accessibility = 0.0
+        pop_lat, pop_lng = coords_to_array(population_centers).T
+        populations = np.fromiter((pc.get('population', 1000) for pc in population_centers), dtype=np.float64)
+        total_population = populations.sum()
         
-        for pop_center in population_centers:
-            pop_point = Point(pop_center['lng'], pop_center['lat'])
-            min_distance = float('inf')
-            
-            # Find closest green zone
-            for zone in green_zones:
-                if 'coordinates' in zone and zone['coordinates']:
-                    zone_coords = zone['coordinates']
-                    zone_center_lat = sum(c['lat'] for c in zone_coords) / len(zone_coords)
-                    zone_center_lng = sum(c['lng'] for c in zone_coords) / len(zone_coords)
-                    
-                    distance = geodesic(
-                        (pop_center['lat'], pop_center['lng']),
-                        (zone_center_lat, zone_center_lng)
-                    ).meters
-                    
-                    min_distance = min(min_distance, distance)
-            
-            # Convert distance to accessibility score (closer = better)
-            if min_distance < float('inf'):
-                accessibility = max(0, 100 - (min_distance / 50))  # 50m = 100% accessible
-                total_accessibility += accessibility * pop_center.get('population', 1000)
+        # Distance from every population center to its closest green zone center
+        zone_lat, zone_lng = zone_centers(green_zones)
+        if len(zone_lat) == 0 or total_population <= 0:
+            return 0.0
+        min_distance = geodesic_vec(pop_lat[:, None], pop_lng[:, None], zone_lat[None, :], zone_lng[None, :]).min(axis=1)
         
-        total_population = sum(pc.get('population', 1000) for pc in population_centers)
-        return total_accessibility / total_population if total_population > 0 else 0.0
+        # Convert distance to accessibility score (closer = better)
+        accessibility = np.maximum(0, 100 - (min_distance / 50))  # 50m = 100% accessible
+        return float(accessibility @ populations / total_population)
     
     def _generate_population_centers(self, green_zones: List[Dict]) -> List[Dict]:
         """Generate synthetic population centers around green zones"""
@@ -170,10 +314,8 @@ class GeospatialProcessor:
         if not all_coords:
             return []
         
-        min_lat = min(c['lat'] for c in all_coords)
-        max_lat = max(c['lat'] for c in all_coords)
-        min_lng = min(c['lng'] for c in all_coords)
-        max_lng = max(c['lng'] for c in all_coords)
+        latlng = coords_to_array(all_coords)
+        (min_lat, min_lng), (max_lat, max_lng) = latlng.min(axis=0), latlng.max(axis=0)
         
         # Generate population centers
         population_centers = []
@@ -195,33 +337,22 @@ class GeospatialProcessor:
         if len(green_zones) < 2:
             return 0.0
         
-        total_connectivity = 0.0
-        connections = 0
-        
-        for i, zone1 in enumerate(green_zones):
-            for zone2 in green_zones[i+1:]:
-                if 'coordinates' in zone1 and 'coordinates' in zone2:
-                    # Calculate distance between zone centers
-                    zone1_coords = zone1['coordinates']
-                    zone2_coords = zone2['coordinates']
-                    
-                    if zone1_coords and zone2_coords:
-                        center1_lat = sum(c['lat'] for c in zone1_coords) / len(zone1_coords)
-                        center1_lng = sum(c['lng'] for c in zone1_coords) / len(zone1_coords)
-                        center2_lat = sum(c['lat'] for c in zone2_coords) / len(zone2_coords)
-                        center2_lng = sum(c['lng'] for c in zone2_coords) / len(zone2_coords)
-                        
-                        distance = geodesic(
-                            (center1_lat, center1_lng),
-                            (center2_lat, center2_lng)
-                        ).meters
-                        
-                        # Connectivity decreases with distance
-                        connectivity = max(0, 100 - (distance / 20))  # 20m = 100% connected
-                        total_connectivity += connectivity
-                        connections += 1
-        
-        return total_connectivity / connections if connections > 0 else 0.0
+        zone_lat, zone_lng = zone_centers(green_zones)
+        pair_count = len(zone_lat) * (len(zone_lat) - 1) // 2
+        if pair_count == 0:
+            return 0.0
+        
+        # Only pairs within 2 km score at all, where a flat-earth approximation is close enough.
+        # Scaling longitude by the smallest cos(lat) of any zone never overstates the distance,
+        # so a KD-tree radius query returns every scoring pair without visiting all of them.
+        cos_lat = np.cos(np.radians(np.abs(zone_lat).max()))
+        points = np.column_stack((zone_lng * cos_lat, zone_lat)) * 111000
+        i, j = cKDTree(points).query_pairs(2000, output_type='ndarray').T
+        distance = equirectangular_vec(zone_lat[i], zone_lng[i], zone_lat[j], zone_lng[j])
+        
+        # Connectivity decreases with distance; pairs beyond the radius add zero to the mean
+        connectivity = np.maximum(0, 100 - (distance / 20))  # 20m = 100% connected
+        return float(connectivity.sum() / pair_count)
     
     def create_folium_map(self, region_coords: List[Dict], green_zones: List[Dict] = None) -> str:
         """Create an interactive Folium map"""
@@ -229,16 +360,14 @@ class GeospatialProcessor:
             return ""
         
         # Calculate center
-        center_lat = sum(c['lat'] for c in region_coords) / len(region_coords)
-        center_lng = sum(c['lng'] for c in region_coords) / len(region_coords)
+        region_latlng = coords_to_array(region_coords)
         
         # Create map
-        m = folium.Map(location=[center_lat, center_lng], zoom_start=15)
+        m = folium.Map(location=region_latlng.mean(axis=0).tolist(), zoom_start=15)
         
         # Add region boundary
-        region_coords_folium = [[c['lat'], c['lng']] for c in region_coords]
         folium.Polygon(
-            locations=region_coords_folium,
+            locations=region_latlng.tolist(),
             color='blue',
             weight=2,
             fillColor='lightblue',
@@ -248,51 +377,59 @@ class GeospatialProcessor:
         
         # Add green zones
         if green_zones:
-            zone_colors = {
-                'park': 'green',
-                'garden': 'lightgreen',
-                'forest': 'darkgreen',
-                'wetland': 'blue'
-            }
-            
+            # One GeoJSON layer for all zones instead of a Polygon element per zone
+            features = []
             for zone in green_zones:
                 if 'coordinates' in zone and zone['coordinates']:
-                    zone_coords = [[c['lat'], c['lng']] for c in zone['coordinates']]
-                    color = zone_colors.get(zone.get('type', 'park'), 'green')
-                    
-                    folium.Polygon(
-                        locations=zone_coords,
-                        color=color,
-                        weight=2,
-                        fillColor=color,
-                        fillOpacity=0.6,
-                        popup=f"{zone.get('name', 'Green Zone')} ({zone.get('type', 'park')})"
-                    ).add_to(m)
+                    ring = coords_to_array(zone['coordinates'])[:, ::-1].tolist()
+                    if ring[0] != ring[-1]:
+                        ring.append(ring[0])
+                    zone_type = zone.get('type', 'park')
+                    features.append({
+                        'type': 'Feature',
+                        'properties': {
+                            'name': zone.get('name', 'Green Zone'),
+                            'type': zone_type,
+                            'label': f"{zone.get('name', 'Green Zone')} ({zone_type})",
+                            'color': ZONE_COLORS.get(zone_type, 'green')
+                        },
+                        'geometry': {'type': 'Polygon', 'coordinates': [ring]}
+                    })
+            
+            if features:
+                folium.GeoJson(
+                    {'type': 'FeatureCollection', 'features': features},
+                    name='Green Zones',
+                    style_function=lambda feature: {
+                        'color': feature['properties']['color'],
+                        'weight': 2,
+                        'fillColor': feature['properties']['color'],
+                        'fillOpacity': 0.6
+                    },
+                    popup=folium.GeoJsonPopup(fields=['label'], labels=False)
+                ).add_to(m)
         
         return m._repr_html_()
     
-    def validate_coordinates(self, coordinates: List[Dict]) -> bool:
+    def validate_coordinates(self, coordinates: Union[List[Dict], np.ndarray]) -> bool:
         """Validate coordinate format and values"""
-        if not coordinates or len(coordinates) < 3:
+        if coordinates is None or len(coordinates) < 3:
             return False
         
-        for coord in coordinates:
-            if not isinstance(coord, dict):
-                return False
-            
-            if 'lat' not in coord or 'lng' not in coord:
-                return False
-            
-            try:
-                lat = float(coord['lat'])
-                lng = float(coord['lng'])
-                
-                if not (-90 <= lat <= 90) or not (-180 <= lng <= 180):
-                    return False
-            except (ValueError, TypeError):
+        if isinstance(coordinates, np.ndarray):
+            if coordinates.ndim != 2 or coordinates.shape[1] != 2:
                 return False
+        elif not all(isinstance(coord, dict) for coord in coordinates):
+            return False
+        
+        try:
+            latlng = coords_to_array(coordinates)
+        except (KeyError, ValueError, TypeError):
+            return False
         
-        return True
+        # One vectorized range check for every coordinate; NaN fails the comparisons
+        lat, lng = latlng[:, 0], latlng[:, 1]
+        return bool(np.all((-90 <= lat) & (lat <= 90) & (-180 <= lng) & (lng <= 180)))
     
     def simplify_polygon(self, coordinates: List[Dict], tolerance: float = 0.0001) -> List[Dict]:
         """Simplify polygon to reduce coordinate count"""
@@ -1,6 +1,18 @@
 import os
 
 bind = f"0.0.0.0:{os.environ.get('PORT', 8000)}"
-workers = 2
+# Analysis and GNN inference are CPU-bound, so scale with the cores available
+workers = int(os.environ.get("WEB_CONCURRENCY", (os.cpu_count() or 1) * 2 + 1))
+# UvicornWorker picks uvloop and httptools automatically when they are installed
 worker_class = "uvicorn.workers.UvicornWorker"
-timeout = 120
\ No newline at end of file
+timeout = 120
+# Import NumPy, PyTorch and the app once in the master; workers fork and share those pages
+preload_app = True
+# Heartbeat files on tmpfs so a slow container disk cannot stall workers
+if os.path.isdir("/dev/shm"):
+    worker_tmp_dir = "/dev/shm"
+
+def post_fork(server, worker):
+    """Give each worker a fresh connection pool instead of the master's preloaded one"""
+    from app.config.database import engine
+    engine.sync_engine.dispose(close=False)
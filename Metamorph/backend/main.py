@@ -1,6 +1,6 @@
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
 import uvicorn
 from contextlib import asynccontextmanager
 import logging
@@ -14,19 +14,34 @@ async def lifespan(app: FastAPI):
     # Startup
     try:
         from app.config.database import init_db
-        init_db()
+        await init_db()
         logger.info("Database initialized")
     except Exception as e:
         logger.error(f"Database initialization failed: {e}")
+    # Router startup hooks do not run under a lifespan handler, so the model loads here,
+    # once per worker after gunicorn forks
+    try:
+        from app.routes import gnn
+        gnn.load_gnn_model()
+        if gnn.gnn_model is None:
+            logger.error("GNN model unavailable; /api/gnn endpoints will return 503")
+    except ImportError as e:
+        logger.error(f"GNN model loading failed: {e}")
     yield
     # Shutdown
+    try:
+        from app.config.database import engine
+        await engine.dispose()
+    except Exception as e:
+        logger.error(f"Database shutdown failed: {e}")
     logger.info("Application shutdown")
 
 app = FastAPI(
     title="Urban Planning GNN API",
     description="Backend API for Generative Urban City Planner with GNN optimization",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 # CORS middleware
@@ -35,11 +50,12 @@ app.add_middleware(
     allow_origins=[
         "http://localhost:5173", 
         "http://localhost:3000",
-        "https://metamorph-frontend.onrender.com",
-        "https://*.onrender.com"
+        "https://metamorph-frontend.onrender.com"
     ],
+    # Wildcards are not expanded in allow_origins; preview deploys match this pattern instead
+    allow_origin_regex=r"https://[a-z0-9-]+\.onrender\.com",
     allow_credentials=True,
-    allow_methods=["*"],
+    allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
     allow_headers=["*"],
 )
 
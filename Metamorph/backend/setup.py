@@ -9,6 +9,8 @@ setup(
     python_requires=">=3.9",
     install_requires=[
         "fastapi>=0.104.1",
+        "orjson>=3.9.10",
+        "cachetools>=5.3.2",
         "uvicorn[standard]>=0.24.0",
         "pydantic>=2.5.0",
         "torch>=2.1.0",
@@ -17,6 +19,7 @@ setup(
         "shapely>=2.0.2",
         "rasterio>=1.3.9",
         "numpy>=1.24.3",
+        "scipy>=1.11.4",
         "pandas>=2.1.3",
         "scikit-learn>=1.3.2",
         "matplotlib>=3.8.2",
@@ -25,7 +28,8 @@ setup(
         "python-dotenv>=1.0.0",
         "sqlalchemy>=2.0.23",
         "alembic>=1.13.0",
-        "psycopg2-binary>=2.9.9",
+        "asyncpg>=0.29.0",
+        "aiosqlite>=0.19.0",
         "redis>=5.0.1",
         "celery>=5.3.4",
         "networkx>=3.2.1",
@@ -40,6 +44,9 @@ setup(
             "mypy>=1.5.0",
             "flake8>=6.0.0",
         ],
+        "jit": [
+            "numba>=0.58.1",
+        ],
         "gpu": [
             "torch>=2.1.0+cu118",
             "torch-geometric>=2.4.0",